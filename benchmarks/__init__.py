@@ -0,0 +1 @@
+"""Benchmarks of report creation on synthetic issues."""
@@ -0,0 +1,310 @@
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+from typing_extensions import Annotated
+
+from gitlab_report.database import Backend, IssueStore, Issues
+from gitlab_report.export.html import generate_html
+from gitlab_report.export.json import iter_json
+from gitlab_report.export.markdown import generate_markdown
+from gitlab_report.report import build_report, fetch_issues
+
+from .data import generate_issues
+from .fixtures import CONFIGS
+from .server import MockGitLab
+
+app = typer.Typer(
+    add_completion=False,
+    context_settings={
+        "help_option_names": ["-h", "--help"],
+    },
+)
+
+
+@app.command()
+def report(
+    *,
+    sizes: Annotated[
+        list[int],
+        typer.Option(
+            "--size",
+            "-n",
+            help="Numbers of synthetic issues.",
+            min=1,
+        ),
+    ] = [10_000, 100_000],
+    fixtures: Annotated[
+        list[str],
+        typer.Option(
+            "--fixture",
+            "-x",
+            help=f"Report configurations ({', '.join(CONFIGS)}).",
+        ),
+    ] = list(CONFIGS),
+    seed: Annotated[
+        int,
+        typer.Option(help="Seed of the synthetic issues."),
+    ] = 0,
+    repeat: Annotated[
+        int,
+        typer.Option(help="Number of timed runs of each phase.", min=1),
+    ] = 3,
+    baseline: Annotated[
+        Optional[Path],
+        typer.Option(
+            help="Results of a previous run to compare with.",
+            exists=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    save: Annotated[
+        Optional[Path],
+        typer.Option(help="File to save the results to.", dir_okay=False),
+    ] = None,
+    tolerance: Annotated[
+        float,
+        typer.Option(help="Relative slowdown against the baseline to fail on."),
+    ] = 0.25,
+) -> None:
+    """Benchmark creating reports from synthetic issues.
+
+    Every phase is timed as the best of several runs, and its peak memory is
+    measured by a separate run traced by tracemalloc.
+    """
+    _check_fixtures(fixtures)
+
+    previous = json.loads(baseline.read_text()) if baseline else {}
+    results: dict[str, dict[str, float]] = {}
+
+    def run(
+        name: str,
+        phase: Callable[..., Any],
+        setup: Callable[[], Any] | None = None,
+    ) -> Any:
+        result = _measure(phase, setup=setup, repeat=repeat)
+        results[name] = result.pop("stats")
+        _print(name, results[name], previous.get(name), tolerance)
+        return result["value"]
+
+    for size in sizes:
+        issues = generate_issues(size, seed=seed)
+        run(f"{size}/table", lambda: Issues(issues))
+
+        for fixture in fixtures:
+            config = CONFIGS[fixture]
+            # Every run starts with a table without cached filter results.
+            report = run(
+                f"{size}/{fixture}/report",
+                lambda table: build_report(config, table),
+                setup=lambda: Issues(issues),
+            )
+            run(f"{size}/{fixture}/markdown", lambda: generate_markdown(report))
+            run(f"{size}/{fixture}/html", lambda: generate_html(report))
+            run(f"{size}/{fixture}/json", lambda: "".join(iter_json(report)))
+
+        del issues
+
+    if save:
+        save.write_text(json.dumps(results, indent=2))
+
+    regressions = [
+        name
+        for name, stats in results.items()
+        if name in previous and _slowdown(stats, previous[name]) > tolerance
+    ]
+    if regressions:
+        typer.echo(f"Regressions: {', '.join(regressions)}", err=True)
+        raise typer.Exit(1)
+
+
+@app.command()
+def fetch(
+    *,
+    sizes: Annotated[
+        list[int],
+        typer.Option(
+            "--size",
+            "-n",
+            help="Numbers of synthetic issues.",
+            min=1,
+        ),
+    ] = [10_000],
+    fixtures: Annotated[
+        list[str],
+        typer.Option(
+            "--fixture",
+            "-x",
+            help=f"Report configurations ({', '.join(CONFIGS)}).",
+        ),
+    ] = list(CONFIGS),
+    seed: Annotated[
+        int,
+        typer.Option(help="Seed of the synthetic issues."),
+    ] = 0,
+    concurrency: Annotated[
+        int,
+        typer.Option(help="Number of concurrent API requests.", min=1),
+    ] = 8,
+    latency: Annotated[
+        float,
+        typer.Option(help="Latency of the API in seconds.", min=0),
+    ] = 0.05,
+    jitter: Annotated[
+        float,
+        typer.Option(help="Maximum deviation from the latency in seconds.", min=0),
+    ] = 0.02,
+    rate_limit: Annotated[
+        Optional[int],
+        typer.Option(help="Number of requests allowed per minute.", min=1),
+    ] = None,
+    throttle_rate: Annotated[
+        float,
+        typer.Option(help="Fraction of requests throttled at random.", min=0, max=1),
+    ] = 0.0,
+    save: Annotated[
+        Optional[Path],
+        typer.Option(help="File to save the results to.", dir_okay=False),
+    ] = None,
+) -> None:
+    """Benchmark fetching issues from a local mock of the GitLab API.
+
+    Issues of each report configuration are fetched with the REST and the
+    GraphQL APIs, and synced into an empty and then an up-to-date local store.
+    Every strategy is reported with its time and number of requests.
+    """
+    _check_fixtures(fixtures)
+
+    results: dict[str, dict[str, Any]] = {}
+
+    for size in sizes:
+        issues = generate_issues(size, seed=seed)
+        server = MockGitLab(
+            issues,
+            latency=latency,
+            jitter=jitter,
+            rate_limit=rate_limit,
+            throttle_rate=throttle_rate,
+            seed=seed,
+        )
+
+        with server, tempfile.TemporaryDirectory() as directory:
+            for fixture in fixtures:
+                config = CONFIGS[fixture]
+                store = IssueStore(
+                    Path(directory) / f"{fixture}.sqlite", instance=server.url
+                )
+
+                strategies = {
+                    "rest": {"backend": Backend.REST},
+                    "graphql": {"backend": Backend.GraphQL},
+                    "store-cold": {"issue_store": store},
+                    "store-warm": {"issue_store": store},
+                }
+                for strategy, kwargs in strategies.items():
+                    server.counts.clear()
+                    server.throttled = 0
+                    gc.collect()
+                    start = time.perf_counter()
+                    fetched = fetch_issues(
+                        [config],
+                        url=server.url,
+                        access_token="benchmark",
+                        concurrency=concurrency,
+                        **kwargs,
+                    )
+                    name = f"{size}/{fixture}/{strategy}"
+                    results[name] = {
+                        "time": time.perf_counter() - start,
+                        "issues": fetched.total(),
+                        "requests": dict(server.counts),
+                        "throttled": server.throttled,
+                    }
+                    _print_fetch(name, results[name])
+
+                store.close()
+
+        del issues
+
+    if save:
+        save.write_text(json.dumps(results, indent=2))
+
+
+def _check_fixtures(fixtures: list[str]) -> None:
+    unknown = set(fixtures) - CONFIGS.keys()
+    if unknown:
+        raise typer.BadParameter(f"unknown fixtures: {', '.join(sorted(unknown))}")
+
+
+def _measure(
+    phase: Callable[..., Any],
+    *,
+    setup: Callable[[], Any] | None,
+    repeat: int,
+) -> dict[str, Any]:
+    """Measure the best time and the peak memory of the phase.
+
+    The result of the setup, which is not measured, is passed to the phase.
+    """
+    times = []
+    for _ in range(repeat):
+        arguments = [setup()] if setup else []
+        gc.collect()
+        start = time.perf_counter()
+        value = phase(*arguments)
+        times.append(time.perf_counter() - start)
+        del value
+
+    arguments = [setup()] if setup else []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = phase(*arguments)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"value": value, "stats": {"time": min(times), "peak_memory": peak}}
+
+
+def _slowdown(stats: dict[str, float], previous: dict[str, float]) -> float:
+    """Get the relative slowdown of the phase against the previous run."""
+    return stats["time"] / previous["time"] - 1 if previous["time"] else 0
+
+
+def _print(
+    name: str,
+    stats: dict[str, float],
+    previous: dict[str, float] | None,
+    tolerance: float,
+) -> None:
+    line = (
+        f"{name:<32} {stats['time'] * 1000:>10.1f} ms"
+        f" {stats['peak_memory'] / 2**20:>10.1f} MiB"
+    )
+    if previous:
+        slowdown = _slowdown(stats, previous)
+        line += f" {slowdown:>+8.1%}"
+        if slowdown > tolerance:
+            line += " REGRESSION"
+    typer.echo(line)
+
+
+def _print_fetch(name: str, stats: dict[str, Any]) -> None:
+    requests = stats["requests"]
+    typer.echo(
+        f"{name:<32} {stats['time'] * 1000:>10.1f} ms"
+        f" {stats['issues']:>10} issues {sum(requests.values()):>6} requests"
+        f" {stats['throttled']:>6} throttled"
+    )
+    for endpoint, count in sorted(requests.items()):
+        typer.echo(f"  {endpoint:<30} {count:>6}")
+
+
+app()
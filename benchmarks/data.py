@@ -0,0 +1,114 @@
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from gitlab_report.database.models import Issue, IssueState, IssueType, Registry
+
+END = datetime(2024, 12, 31, tzinfo=timezone.utc)
+PERIOD = timedelta(days=2 * 365)
+
+TYPES = [IssueType.Issue, IssueType.Incident, IssueType.Task, IssueType.TestCase]
+TYPE_WEIGHTS = [70, 15, 12, 3]
+
+
+def generate_issues(
+    count: int,
+    *,
+    seed: int = 0,
+    users: int | None = None,
+    labels: int | None = None,
+    projects: int | None = None,
+) -> list[Issue]:
+    """Generate synthetic issues, newest first like the issues API lists them.
+
+    Labels, assignees, authors and projects follow Zipf-like distributions,
+    so a few of them are very common and most are rare, and their numbers grow
+    with the number of issues unless given. The same seed always generates the
+    same issues.
+    """
+    rng = random.Random(seed)
+    registry = Registry()
+
+    users = users or max(20, count // 200)
+    labels = labels or max(50, min(count // 100, 3000))
+    projects = projects or max(10, count // 500)
+    groups = max(3, projects // 20)
+
+    user_pool = [registry.user(id, f"user-{id}") for id in range(1, users + 1)]
+    label_pool = Registry.labels(f"label-{id}" for id in range(1, labels + 1))
+    group_pool = [registry.group(id, f"group-{id}") for id in range(1, groups + 1)]
+    project_pool = [
+        (
+            registry.project(id, f"project-{id}"),
+            # Every tenth project belongs to a user namespace.
+            rng.choice(group_pool) if id % 10 else None,
+        )
+        for id in range(1, projects + 1)
+    ]
+
+    user_weights = _zipf(users)
+    label_weights = _zipf(labels)
+    project_weights = _zipf(projects)
+
+    issues = []
+    for id in range(1, count + 1):
+        created_at = END - PERIOD * rng.random()
+        updated_at = created_at + (END - created_at) * rng.random()
+
+        state = IssueState.Closed if rng.random() < 0.6 else IssueState.Opened
+        closed_at = updated_at if state == IssueState.Closed else None
+
+        due_date = None
+        if rng.random() < 0.3:
+            due_date = (created_at + timedelta(days=rng.randint(1, 60))).date()
+
+        project, group = rng.choices(project_pool, cum_weights=project_weights)[0]
+
+        issues.append(
+            Issue(
+                id=id,
+                type=rng.choices(TYPES, weights=TYPE_WEIGHTS)[0],
+                state=state,
+                author=rng.choices(user_pool, cum_weights=user_weights)[0],
+                assignees=_sample(
+                    rng,
+                    user_pool,
+                    user_weights,
+                    rng.choices([0, 1, 2, 3], [25, 55, 15, 5])[0],
+                ),
+                labels=_sample(
+                    rng,
+                    label_pool,
+                    label_weights,
+                    rng.choices(range(6), [10, 25, 30, 20, 10, 5])[0],
+                ),
+                group=group,
+                project=project,
+                created_at=_format(created_at),
+                updated_at=_format(updated_at),
+                closed_at=_format(closed_at) if closed_at else None,
+                due_date=due_date.isoformat() if due_date else None,
+            )
+        )
+
+    issues.sort(key=lambda issue: (issue.created_at, issue.id), reverse=True)
+    return issues
+
+
+def _zipf(size: int, exponent: float = 1.1) -> list[float]:
+    """Get cumulative Zipf weights of the ranks."""
+    return list(accumulate(1 / rank**exponent for rank in range(1, size + 1)))
+
+
+def _sample(rng: random.Random, pool: list, weights: list[float], size: int) -> list:
+    """Sample distinct items of the pool by their cumulative weights."""
+    items = []
+    for item in rng.choices(pool, cum_weights=weights, k=size):
+        if item not in items:
+            items.append(item)
+    return items
+
+
+def _format(value: datetime) -> str:
+    """Format the datetime like GitLab REST API does."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
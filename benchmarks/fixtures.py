@@ -0,0 +1,80 @@
+from gitlab_report.report import ReportConfig
+
+# Report configurations exercising the hot paths of report creation.
+CONFIGS = {
+    "wide-labels": ReportConfig(
+        title="Labels",
+        sections=[
+            {
+                "title": "Open issues by label",
+                "state": "opened",
+                "group_by": "label",
+                "columns": [
+                    {"title": "Incidents", "type": "incident"},
+                    {"title": "Unassigned", "assignee": "None"},
+                    {"title": "Overdue", "overdue": True},
+                ],
+            },
+            {
+                "title": "All issues by assignee",
+                "group_by": "assignee",
+                "columns": [{"title": "Open", "state": "opened"}],
+            },
+        ],
+    ),
+    "many-columns": ReportConfig(
+        title="Columns",
+        sections=[
+            {
+                "title": "Issues by type",
+                "group_by": [
+                    {"title": "Issues", "type": "issue"},
+                    {"title": "Incidents", "type": "incident"},
+                    {"title": "Tasks", "type": "task"},
+                    {"title": "Test cases", "type": "test_case"},
+                ],
+                "columns": [
+                    {"title": "Open", "state": "opened"},
+                    {"title": "Closed", "state": "closed"},
+                    {"title": "Assigned", "assignee": "Any"},
+                    {"title": "Unassigned", "assignee": "None"},
+                    {"title": "Labelled", "label": "Any"},
+                    {"title": "Unlabelled", "label": "None"},
+                    {"title": "Top labels", "label": ["label-1", "label-2"]},
+                    {"title": "Top authors", "author": [1, 2, 3]},
+                    {"title": "In groups", "group": "Any"},
+                    {"title": "Personal", "group": "None"},
+                    {"title": "Overdue", "overdue": True},
+                    {"title": "On time", "overdue": False},
+                ],
+            },
+            {
+                "title": "Projects",
+                "group_by": "project",
+                "limit": 10,
+                "columns": [
+                    {"title": "Open", "state": "opened"},
+                    {"title": "Incidents", "type": "incident"},
+                ],
+            },
+        ],
+    ),
+    "overdue": ReportConfig(
+        title="Overdue",
+        sections=[
+            {
+                "title": "Overdue issues by group",
+                "overdue": True,
+                "group_by": "group",
+                "columns": [{"title": "Open", "state": "opened"}],
+            },
+            {
+                "title": "Overdue issues by author",
+                "overdue": True,
+                "group_by": "author",
+                "limit": 20,
+                "columns": [{"title": "Incidents", "type": "incident"}],
+            },
+        ],
+    ),
+}
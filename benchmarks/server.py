@@ -0,0 +1,517 @@
+"""Local stand-in for the GitLab API serving synthetic issues.
+
+The server implements the parts of the REST and GraphQL APIs used to fetch
+issues: authentication, the instance, project and group issue endpoints with
+their filters and offset or keyset pagination, projects and the GraphQL
+issues and projects queries. Latency, jitter, rate limits and throttled
+requests can be injected to benchmark fetching under realistic conditions.
+
+Issues are served as if all of them were created by the authenticated user,
+so the default `created_by_me` scope does not narrow them down.
+"""
+
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from gitlab_report.database.models import Group, Issue, Project
+
+USER = {"id": 1, "username": "benchmark", "name": "Benchmark"}
+
+# Number of filtered issue lists kept for paginating through them.
+QUERY_CACHE_SIZE = 64
+
+
+class MockGitLab:
+    """Local GitLab API server serving the issues.
+
+    Requests are delayed by the latency plus a uniformly distributed jitter.
+    If a rate limit is set, requests over the limit within a window get
+    `429 Too Many Requests`, and all responses carry `RateLimit-*` headers.
+    A fraction of requests can be throttled regardless of the rate limit.
+    """
+
+    def __init__(
+        self,
+        issues: list[Issue],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: int | None = None,
+        rate_limit_window: float = 60.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+
+        # Requests by endpoint, including the throttled ones.
+        self.counts: Counter[str] = Counter()
+        self.throttled = 0
+
+        self._issues = sorted(
+            (_rest_issue(issue) for issue in issues),
+            key=lambda issue: (issue["created_at"], issue["id"]),
+            reverse=True,
+        )
+        self._projects: dict[int, tuple[Project, Group | None]] = {
+            issue.project.id: (issue.project, issue.group) for issue in issues
+        }
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self._queries: OrderedDict[tuple, list[dict[str, Any]]] = OrderedDict()
+
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-gitlab", daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        """Get the URL of the GitLab instance."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> Self:
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _admit(self) -> tuple[bool, dict[str, str]]:
+        """Count the request against the rate limit and delay it.
+
+        Returns whether the request is admitted and the rate limit headers.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+
+            observed = self._window_requests
+            limited = self.rate_limit is not None and observed > self.rate_limit
+            throttled = self._random.random() < self.throttle_rate
+            delay = max(0.0, self.latency + self._random.uniform(-1, 1) * self.jitter)
+            remaining = self.rate_limit_window - (now - self._window_start)
+
+        time.sleep(delay)
+
+        headers = {}
+        if self.rate_limit is not None:
+            reset = time.time() + remaining
+            headers = {
+                "RateLimit-Limit": str(self.rate_limit),
+                "RateLimit-Observed": str(observed),
+                "RateLimit-Remaining": str(max(0, self.rate_limit - observed)),
+                "RateLimit-Reset": str(math.ceil(reset)),
+                "RateLimit-ResetTime": formatdate(reset, usegmt=True),
+            }
+        if limited:
+            headers["Retry-After"] = str(math.ceil(remaining))
+        elif throttled:
+            headers["Retry-After"] = str(self.retry_after)
+
+        return not (limited or throttled), headers
+
+    def _list_issues(
+        self, path: str, params: dict[str, str]
+    ) -> list[dict[str, Any]] | None:
+        """Get the issues of the endpoint matching the filters.
+
+        Filtered lists are cached, so paginating through them is cheap.
+        """
+        match = re.fullmatch(r"/api/v4(?:/(projects|groups)/(\d+))?/issues", path)
+        if not match:
+            return None
+
+        filters = {
+            key: value
+            for key, value in params.items()
+            if key not in ("page", "per_page", "cursor", "pagination", "scope")
+        }
+        key = (match.group(1), match.group(2), tuple(sorted(filters.items())))
+
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return self._queries[key]
+
+        issues = [
+            issue
+            for issue in self._issues
+            if _scoped(issue, match.group(1), match.group(2), self._projects)
+            and _matches(issue, filters)
+        ]
+
+        with self._lock:
+            self._queries[key] = issues
+            if len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return issues
+
+    def _project(self, project_id: int) -> dict[str, Any] | None:
+        """Get the project with its namespace."""
+        if project_id not in self._projects:
+            return None
+
+        project, group = self._projects[project_id]
+        return {
+            "id": project.id,
+            "name": project.name,
+            "namespace": (
+                {"id": group.id, "name": group.name, "kind": "group"}
+                if group
+                else {"id": 1_000_000 + project.id, "name": "user", "kind": "user"}
+            ),
+        }
+
+    def _graphql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Execute the GraphQL issues or projects query."""
+        if re.search(r"^\s*projects\(", query, re.MULTILINE):
+            nodes = []
+            for gid in variables["ids"]:
+                project = self._project(int(gid.rsplit("/", 1)[1]))
+                if project:
+                    namespace = project["namespace"]
+                    nodes.append(
+                        {
+                            "id": f"gid://gitlab/Project/{project['id']}",
+                            "name": project["name"],
+                            "namespace": {
+                                "id": f"gid://gitlab/Namespace/{namespace['id']}",
+                                "name": namespace["name"],
+                            },
+                            "group": (
+                                {"id": f"gid://gitlab/Group/{namespace['id']}"}
+                                if namespace["kind"] == "group"
+                                else None
+                            ),
+                        }
+                    )
+            return {"data": {"projects": {"nodes": nodes}}}
+
+        filters = {
+            name: variables[variable]
+            for name, variable in (
+                ("created_after", "createdAfter"),
+                ("created_before", "createdBefore"),
+                ("updated_after", "updatedAfter"),
+            )
+            if variables.get(variable)
+        }
+        issues = self._list_issues("/api/v4/issues", filters) or []
+
+        start = int(variables.get("after") or 0)
+        end = start + variables["first"]
+        return {
+            "data": {
+                "issues": {
+                    "pageInfo": {
+                        "hasNextPage": end < len(issues),
+                        "endCursor": str(end),
+                    },
+                    "nodes": [_graphql_issue(issue) for issue in issues[start:end]],
+                }
+            }
+        }
+
+
+def _handler(server: MockGitLab) -> type[BaseHTTPRequestHandler]:
+    """Create the request handler of the server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and bodies are written separately, so responses would wait
+        # for delayed acknowledgements of kept-alive connections.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = dict(parse_qsl(url.query))
+            if not self._admit(url.path):
+                return
+
+            if url.path == "/api/v4/user":
+                return self._send(USER)
+
+            if match := re.fullmatch(r"/api/v4/projects/(\d+)", url.path):
+                project = server._project(int(match.group(1)))
+                return self._send(project) if project else self._error(404)
+
+            issues = server._list_issues(url.path, params)
+            if issues is None:
+                return self._error(404)
+
+            if params.get("pagination") == "keyset":
+                return self._send_keyset(url.path, params, issues)
+            return self._send_page(url.path, params, issues)
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if not self._admit(self.path):
+                return
+
+            if self.path != "/api/graphql":
+                return self._error(404)
+
+            return self._send(
+                server._graphql(body["query"], body.get("variables") or {})
+            )
+
+        def _admit(self, path: str) -> bool:
+            """Authenticate and admit the request, counting it by endpoint."""
+            self._headers: dict[str, str] = {}
+            endpoint = re.sub(r"/\d+", "/:id", path.removeprefix("/api/v4"))
+            with server._lock:
+                server.counts[endpoint] += 1
+
+            if not (
+                self.headers.get("PRIVATE-TOKEN") or self.headers.get("Authorization")
+            ):
+                self._error(401)
+                return False
+
+            admitted, self._headers = server._admit()
+            if not admitted:
+                with server._lock:
+                    server.throttled += 1
+                self._error(429)
+            return admitted
+
+        def _send_page(
+            self, path: str, params: dict[str, str], issues: list[dict[str, Any]]
+        ) -> None:
+            """Send a page of the issues with offset pagination headers."""
+            per_page = min(int(params.get("per_page", 20)), 100)
+            page = int(params.get("page", 1))
+            pages = max(1, -(-len(issues) // per_page))
+
+            headers = {
+                "X-Page": str(page),
+                "X-Per-Page": str(per_page),
+                "X-Total": str(len(issues)),
+                "X-Total-Pages": str(pages),
+                "X-Prev-Page": str(page - 1) if page > 1 else "",
+                "X-Next-Page": str(page + 1) if page < pages else "",
+            }
+
+            links = {"first": 1, "last": pages}
+            if page > 1:
+                links["prev"] = page - 1
+            if page < pages:
+                links["next"] = page + 1
+            headers["Link"] = ", ".join(
+                f'<{self._url(path, params | {"page": str(number)})}>; rel="{rel}"'
+                for rel, number in links.items()
+            )
+
+            start = (page - 1) * per_page
+            self._send(issues[start : start + per_page], headers)
+
+        def _send_keyset(
+            self, path: str, params: dict[str, str], issues: list[dict[str, Any]]
+        ) -> None:
+            """Send a page of the issues with keyset pagination headers."""
+            per_page = min(int(params.get("per_page", 20)), 100)
+
+            start = 0
+            if cursor := params.get("cursor"):
+                start = _after(issues, json.loads(base64.urlsafe_b64decode(cursor)))
+
+            page = issues[start : start + per_page]
+            headers = {}
+            if start + per_page < len(issues):
+                last = page[-1]
+                cursor = base64.urlsafe_b64encode(
+                    json.dumps([last["created_at"], last["id"]]).encode()
+                ).decode()
+                headers["Link"] = (
+                    f'<{self._url(path, params | {"cursor": cursor})}>; rel="next"'
+                )
+
+            self._send(page, headers)
+
+        def _url(self, path: str, params: dict[str, str]) -> str:
+            return f"http://{self.headers['Host']}{path}?{urlencode(params)}"
+
+        def _send(self, data: Any, headers: dict[str, str] | None = None) -> None:
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (self._headers | (headers or {})).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status: int) -> None:
+            body = json.dumps({"message": self.responses[status][0]}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in self._headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def _scoped(
+    issue: dict[str, Any],
+    scope: str | None,
+    id: str | None,
+    projects: dict[int, tuple[Project, Group | None]],
+) -> bool:
+    """Check whether the issue is listed by the endpoint."""
+    if scope == "projects":
+        return issue["project_id"] == int(id)
+
+    if scope == "groups":
+        group = projects[issue["project_id"]][1]
+        return group is not None and group.id == int(id)
+
+    return True
+
+
+def _matches(issue: dict[str, Any], filters: dict[str, str]) -> bool:
+    """Check whether the issue matches the filters of the issues API."""
+    for name, value in filters.items():
+        if name == "state" and issue["state"] != value:
+            return False
+
+        if name == "issue_type" and issue["issue_type"] != value:
+            return False
+
+        if name == "author_id" and issue["author"]["id"] != int(value):
+            return False
+
+        if name == "assignee_id":
+            assignees = [assignee["id"] for assignee in issue["assignees"]]
+            if value == "None" and assignees or value == "Any" and not assignees:
+                return False
+            if value not in ("None", "Any") and int(value) not in assignees:
+                return False
+
+        if name == "labels":
+            labels = issue["labels"]
+            if value == "None" and labels or value == "Any" and not labels:
+                return False
+            if value not in ("None", "Any") and not set(value.split(",")) <= set(
+                labels
+            ):
+                return False
+
+        for bound in ("created_after", "created_before", "updated_after"):
+            if name == bound:
+                field = bound.split("_")[0] + "_at"
+                time = _timestamp(issue[field])
+                if bound.endswith("after") and time < _timestamp(value):
+                    return False
+                if bound.endswith("before") and time > _timestamp(value):
+                    return False
+
+    return True
+
+
+def _after(issues: list[dict[str, Any]], cursor: list[Any]) -> int:
+    """Get the position of the first issue after the cursor.
+
+    Issues are ordered from the newest one, with the cursor being the creation
+    time and ID of the last issue of the previous page.
+    """
+    key = tuple(cursor)
+    low, high = 0, len(issues)
+    while low < high:
+        middle = (low + high) // 2
+        if (issues[middle]["created_at"], issues[middle]["id"]) < key:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _timestamp(value: str) -> float:
+    parsed = datetime.fromisoformat(value)
+    if not parsed.tzinfo:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _rest_issue(issue: Issue) -> dict[str, Any]:
+    """Convert the issue to its REST API representation."""
+    return {
+        "id": issue.id,
+        "iid": issue.id,
+        "project_id": issue.project.id,
+        "issue_type": issue.type,
+        "state": issue.state,
+        "author": {"id": issue.author.id, "name": issue.author.name},
+        "assignees": [
+            {"id": assignee.id, "name": assignee.name} for assignee in issue.assignees
+        ],
+        "labels": issue.labels,
+        "created_at": issue.created_at,
+        "updated_at": issue.updated_at,
+        "closed_at": issue.closed_at,
+        "due_date": issue.due_date,
+    }
+
+
+def _graphql_issue(issue: dict[str, Any]) -> dict[str, Any]:
+    """Convert the REST API issue to its GraphQL API representation."""
+    return {
+        "id": f"gid://gitlab/Issue/{issue['id']}",
+        "type": issue["issue_type"].upper(),
+        "state": issue["state"],
+        "projectId": issue["project_id"],
+        "createdAt": issue["created_at"],
+        "updatedAt": issue["updated_at"],
+        "closedAt": issue["closed_at"],
+        "dueDate": issue["due_date"],
+        "author": {
+            "id": f"gid://gitlab/User/{issue['author']['id']}",
+            "name": issue["author"]["name"],
+        },
+        "assignees": {
+            "nodes": [
+                {"id": f"gid://gitlab/User/{assignee['id']}", "name": assignee["name"]}
+                for assignee in issue["assignees"]
+            ]
+        },
+        "labels": {"nodes": [{"title": label} for label in issue["labels"]]},
+    }
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 
+from .. import profiling
 from ..database import Issues
 from ..database.collections.issues import Filter
+from ..database.counter import IssueCounter
 
 
 @dataclass(kw_only=True)
@@ -17,10 +19,26 @@ class Column:
     def __init__(self, config: ColumnConfig) -> None:
         self._config = config
         self._issues = None
+        self._total = None
 
-    def load(self, issues: Issues) -> None:
-        """Load the data for the column."""
-        self._issues = issues.filter(self._config)
+    def load(self, issues: Issues, *, aggregate: bool = False) -> None:
+        """Load the data for the column.
+
+        In aggregation mode only the aggregates are kept, not the issues.
+        """
+        with profiling.span("column", title=self._config.title) as span:
+            issues = issues.filter(self._config)
+            self._issues = None if aggregate else issues
+            self._total = span["issues"] = issues.total()
+
+    def aggregate(self, total: int) -> None:
+        """Set the aggregates of the column computed along with its group."""
+        self._issues = None
+        self._total = total
+
+    def count(self, counter: IssueCounter, filters: list[Filter]) -> None:
+        """Count the issues for the column matching the parent filters."""
+        self._total = counter.count([*filters, self._config])
 
     @property
     def title(self) -> str:
@@ -30,6 +48,13 @@ class Column:
     @property
     def total(self) -> int:
         """Get the total number of issues."""
-        if not self._issues:
+        if self._total is None:
             raise ValueError("column data has not been loaded")
-        return self._issues.total()
+        return self._total
+
+    @property
+    def issues(self) -> Issues:
+        """Get the issues of the column."""
+        if self._issues is None:
+            raise ValueError("column issues have not been loaded")
+        return self._issues
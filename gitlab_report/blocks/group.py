@@ -1,7 +1,10 @@
+import heapq
 from dataclasses import dataclass
 
+from .. import profiling
 from ..database import Issues
 from ..database.collections.issues import Filter, GroupBy
+from ..database.counter import IssueCounter
 from .column import Column, ColumnConfig
 
 
@@ -18,13 +21,27 @@ class Group:
     def __init__(self, config: GroupConfig, columns: list[ColumnConfig]) -> None:
         self._config = config
         self._issues = None
+        self._total = None
         self._columns = [Column(column_config) for column_config in columns]
 
-    def load(self, issues: Issues) -> None:
-        """Load the data for the group."""
-        self._issues = issues.filter(self._config)
+    def load(self, issues: Issues, *, aggregate: bool = False) -> None:
+        """Load the data for the group.
+
+        In aggregation mode only the aggregates are kept, not the issues.
+        """
+        with profiling.span("group", title=self._config.title) as span:
+            issues = issues.filter(self._config)
+            self._issues = None if aggregate else issues
+            self._total = span["issues"] = issues.total()
+            for column in self._columns:
+                column.load(issues, aggregate=aggregate)
+
+    def count(self, counter: IssueCounter, filters: list[Filter]) -> None:
+        """Count the issues for the group matching the parent filters."""
+        filters = [*filters, self._config]
+        self._total = counter.count(filters)
         for column in self._columns:
-            column.load(self._issues)
+            column.count(counter, filters)
 
     @classmethod
     def from_group_by(
@@ -32,12 +49,36 @@ class Group:
         group_by: GroupBy,
         issues: Issues,
         columns: list[ColumnConfig],
+        *,
+        limit: int | None = None,
+        aggregate: bool = False,
     ) -> "list[Group]":
-        """Create a group from the data."""
+        """Create the groups from the data, from the largest one.
+
+        If a limit is set, only the largest groups are created, so columns are
+        only computed for them. In aggregation mode the counts of all groups
+        and columns are computed in a single scan of the issues.
+        """
         groups = []
-        for title, group_issues in issues.group_by(group_by).items():
+        if aggregate:
+            cube = issues.cube(group_by, columns, limit=limit)
+            for title, (total, *totals) in cube.items():
+                group = cls(GroupConfig(title=str(title)), columns)
+                group._total = total
+                for column, column_total in zip(group._columns, totals):
+                    column.aggregate(column_total)
+                groups.append(group)
+            return groups
+
+        partitions = issues.group_by(group_by)
+        top = heapq.nlargest(
+            limit if limit is not None else len(partitions),
+            partitions,
+            key=lambda title: partitions[title].total(),
+        )
+        for title in top:
             group = cls(GroupConfig(title=str(title)), columns)
-            group.load(group_issues)
+            group.load(partitions[title])
             groups.append(group)
         return groups
 
@@ -49,9 +90,16 @@ class Group:
     @property
     def total(self) -> int:
         """Get the total number of issues."""
-        if not self._issues:
+        if self._total is None:
             raise ValueError("group data has not been loaded")
-        return self._issues.total()
+        return self._total
+
+    @property
+    def issues(self) -> Issues:
+        """Get the issues of the group."""
+        if self._issues is None:
+            raise ValueError("group issues have not been loaded")
+        return self._issues
 
     @property
     def columns(self) -> list[Column]:
@@ -60,6 +108,4 @@ class Group:
 
     def __lt__(self, other: "Group") -> bool:
         """Compare the groups."""
-        if not self._issues or not other._issues:
-            raise ValueError("group data has not been loaded")
-        return self._issues.total() < other._issues.total()
+        return self.total < other.total
@@ -2,7 +2,9 @@ from dataclasses import dataclass
 
 from pydantic import Field
 
+from .. import profiling
 from ..database.collections.issues import Filter, GroupBy, Issues
+from ..database.counter import IssueCounter
 from .column import ColumnConfig
 from .group import Group, GroupConfig
 
@@ -25,26 +27,51 @@ class Section:
     def __init__(self, config: SectionConfig) -> None:
         self._config = config
         self._issues = None
+        self._total = None
         self._groups = None
 
-    def load(self, issues: Issues) -> None:
-        """Load the data for the section."""
-        self._issues = issues.filter(self._config)
+    def load(self, issues: Issues, *, aggregate: bool = False) -> None:
+        """Load the data for the section.
 
+        In aggregation mode only the aggregates are kept, not the issues, so
+        memory of the loaded section does not grow with the number of issues.
+        """
+        with profiling.span("section", title=self._config.title) as span:
+            issues = issues.filter(self._config)
+            self._issues = None if aggregate else issues
+            self._total = span["issues"] = issues.total()
+
+            if isinstance(self._config.group_by, GroupBy):
+                self._groups = Group.from_group_by(
+                    self._config.group_by,
+                    issues,
+                    self._config.columns,
+                    limit=self._config.limit,
+                    aggregate=aggregate,
+                )
+
+            else:
+                self._groups = [
+                    Group(group_config, self._config.columns)
+                    for group_config in self._config.group_by
+                ]
+                for group in self._groups:
+                    group.load(issues, aggregate=aggregate)
+
+    def count(self, counter: IssueCounter) -> None:
+        """Count the issues for the section, fetching them only if needed."""
         if isinstance(self._config.group_by, GroupBy):
-            self._groups = Group.from_group_by(
-                self._config.group_by, self._issues, self._config.columns
-            )
-            self._groups.sort(reverse=True)
-            self._groups = self._groups[: self._config.limit]
-
-        else:
-            self._groups = [
-                Group(group_config, self._config.columns)
-                for group_config in self._config.group_by
-            ]
-            for group in self._groups:
-                group.load(self._issues)
+            # Groups are only known once the issues are fetched.
+            self.load(counter.issues(), aggregate=True)
+            return
+
+        self._total = counter.count([self._config])
+        self._groups = [
+            Group(group_config, self._config.columns)
+            for group_config in self._config.group_by
+        ]
+        for group in self._groups:
+            group.count(counter, [self._config])
 
     @property
     def title(self) -> str:
@@ -54,9 +81,16 @@ class Section:
     @property
     def total(self) -> int:
         """Get the total number of issues."""
-        if not self._issues:
+        if self._total is None:
             raise ValueError("section data has not been loaded")
-        return self._issues.total()
+        return self._total
+
+    @property
+    def issues(self) -> Issues:
+        """Get the issues of the section."""
+        if self._issues is None:
+            raise ValueError("section issues have not been loaded")
+        return self._issues
 
     @property
     def groups(self) -> list[Group]:
@@ -1,17 +1,46 @@
-import importlib
 import json
-from datetime import datetime
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import typer
+from typer.core import TyperGroup
 from typing_extensions import Annotated
 
-from . import __version__
-from .export import Format
-from .report import ReportConfig, create_report
+from . import __version__, profiling
+from .database import (
+    Backend,
+    IssueStore,
+    ProjectCache,
+    Transport,
+    default_cache_dir,
+    open_session,
+)
+from .export import Format, export_all
+from .report import ReportConfig, build_report, create_report, fetch_issues
+
+
+class DefaultCommandGroup(TyperGroup):
+    """Group of commands running the report command unless another is given.
+
+    Reports used to be created without naming a command, e.g.
+    `gitlab-report <config-file>`, which keeps working.
+    """
+
+    default_command = "report"
+
+    def parse_args(self, ctx: typer.Context, args: list[str]) -> list[str]:
+        group_options = ["--version", "-v", *ctx.help_option_names]
+        if args and args[0] not in self.commands and args[0] not in group_options:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
 
 app = typer.Typer(
+    cls=DefaultCommandGroup,
     add_completion=False,
     context_settings={
         "help_option_names": ["-h", "--help"],
@@ -26,6 +55,159 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+Version = Annotated[
+    bool,
+    typer.Option(
+        "--version",
+        "-v",
+        help="Show version information and exit.",
+        callback=version_callback,
+        is_eager=True,
+    ),
+]
+
+
+@app.callback()
+def main(version: Version = False) -> None:
+    """Create GitLab reports."""
+
+
+Url = Annotated[
+    str,
+    typer.Option(
+        "--url",
+        "-u",
+        help="URL of the GitLab instance.",
+        envvar="GITLAB_URL",
+    ),
+]
+AccessToken = Annotated[
+    Optional[str],
+    typer.Option(
+        help="Either personal, project or group access token for the GitLab API.",
+        envvar="GITLAB_ACCESS_TOKEN",
+    ),
+]
+OAuthToken = Annotated[
+    Optional[str],
+    typer.Option(
+        help="OAuth 2.0 access token for the GitLab API.",
+        envvar="GITLAB_OAUTH_TOKEN",
+    ),
+]
+OutputDir = Annotated[
+    Path,
+    typer.Option(
+        "--output-dir",
+        "-o",
+        help="Output directory for the reports.",
+        exists=True,
+        file_okay=False,
+    ),
+]
+Prefix = Annotated[
+    str,
+    typer.Option(
+        "--prefix",
+        "-p",
+        help="Prefix for the report filenames.",
+    ),
+]
+Formats = Annotated[
+    list[Format],
+    typer.Option(
+        "--format",
+        "-f",
+        help="Formats for the report.",
+    ),
+]
+CAFile = Annotated[
+    Optional[Path],
+    typer.Option(
+        help="Path to a custom CA file for SSL verification.",
+        exists=True,
+        dir_okay=False,
+    ),
+]
+SkipSSL = Annotated[
+    bool,
+    typer.Option(
+        "--skip-ssl",
+        help="Skip SSL verification.",
+    ),
+]
+Concurrency = Annotated[
+    int,
+    typer.Option(
+        "--concurrency",
+        "-j",
+        help="Maximum number of concurrent requests to the GitLab API.",
+        min=1,
+    ),
+]
+CacheDir = Annotated[
+    Path,
+    typer.Option(
+        help="Directory for the on-disk caches.",
+        envvar="GITLAB_REPORT_CACHE_DIR",
+        file_okay=False,
+    ),
+]
+MetadataTTL = Annotated[
+    int,
+    typer.Option(
+        help="Number of hours cached project metadata stays valid.",
+        min=0,
+    ),
+]
+RefreshMetadata = Annotated[
+    bool,
+    typer.Option(
+        "--refresh-metadata",
+        help="Ignore cached project metadata and fetch it again.",
+    ),
+]
+Store = Annotated[
+    bool,
+    typer.Option(
+        "--store",
+        help="Keep issues in a local store and only fetch updated ones.",
+    ),
+]
+BackendOption = Annotated[
+    Backend,
+    typer.Option(
+        "--backend",
+        "-b",
+        help="API used to fetch issues.",
+    ),
+]
+KeepAlive = Annotated[
+    bool,
+    typer.Option(
+        "--keep-alive/--no-keep-alive",
+        help="Keep connections to the GitLab API open for further requests.",
+    ),
+]
+Compression = Annotated[
+    bool,
+    typer.Option(
+        "--compression/--no-compression",
+        help="Request compressed responses from the GitLab API.",
+    ),
+]
+Profile = Annotated[
+    Optional[Path],
+    typer.Option(
+        help=(
+            "File to write a profile summary to, along with Chrome trace events"
+            " to a .trace.json file next to it."
+        ),
+        dir_okay=False,
+    ),
+]
+
+
 @app.command()
 def report(
     config_file: Annotated[
@@ -38,96 +220,208 @@ def report(
         ),
     ],
     *,
-    url: Annotated[
-        str,
-        typer.Option(
-            "--url",
-            "-u",
-            help="URL of the GitLab instance.",
-            envvar="GITLAB_URL",
-        ),
-    ] = "https://gitlab.com",
-    access_token: Annotated[
-        Optional[str],
-        typer.Option(
-            help="Either personal, project or group access token for the GitLab API.",
-            envvar="GITLAB_ACCESS_TOKEN",
-        ),
-    ] = None,
-    oauth_token: Annotated[
-        Optional[str],
-        typer.Option(
-            help="OAuth 2.0 access token for the GitLab API.",
-            envvar="GITLAB_OAUTH_TOKEN",
-        ),
-    ] = None,
-    output_dir: Annotated[
-        Path,
-        typer.Option(
-            "--output-dir",
-            "-o",
-            help="Output directory for the reports.",
-            exists=True,
-            file_okay=False,
-        ),
-    ] = Path.cwd(),
-    prefix: Annotated[
-        str,
-        typer.Option(
-            "--prefix",
-            "-p",
-            help="Prefix for the report filenames.",
-        ),
-    ] = datetime.now().strftime("%Y-%m-%d"),
-    formats: Annotated[
-        list[Format],
-        typer.Option(
-            "--format",
-            "-f",
-            help="Formats for the report.",
-        ),
-    ] = [Format.JSON],
-    ca_file: Annotated[
-        Optional[Path],
-        typer.Option(
-            help="Path to a custom CA file for SSL verification.",
-            exists=True,
-            dir_okay=False,
-        ),
-    ] = None,
-    skip_ssl: Annotated[
+    url: Url = "https://gitlab.com",
+    access_token: AccessToken = None,
+    oauth_token: OAuthToken = None,
+    output_dir: OutputDir = Path.cwd(),
+    prefix: Prefix = datetime.now().strftime("%Y-%m-%d"),
+    formats: Formats = [Format.JSON],
+    ca_file: CAFile = None,
+    skip_ssl: SkipSSL = False,
+    concurrency: Concurrency = 8,
+    cache_dir: CacheDir = default_cache_dir(),
+    metadata_ttl: MetadataTTL = 24 * 7,
+    refresh_metadata: RefreshMetadata = False,
+    store: Store = False,
+    count_only: Annotated[
         bool,
         typer.Option(
-            "--skip-ssl",
-            help="Skip SSL verification.",
+            "--count-only",
+            help="Count issues using API totals instead of fetching them.",
         ),
     ] = False,
-    version: Annotated[
-        bool,
+    backend: BackendOption = Backend.REST,
+    keep_alive: KeepAlive = True,
+    compression: Compression = True,
+    profile: Profile = None,
+    version: Version = False,
+) -> None:
+    """Create GitLab report."""
+    config = _load_config(config_file)
+
+    with _profile(profile):
+        with ExitStack() as stack:
+            report = create_report(
+                config,
+                url=url,
+                access_token=access_token,
+                oauth_token=oauth_token,
+                skip_ssl=skip_ssl,
+                ca_file=ca_file,
+                concurrency=concurrency,
+                **_open_caches(
+                    stack,
+                    cache_dir=cache_dir,
+                    url=url,
+                    metadata_ttl=metadata_ttl,
+                    refresh_metadata=refresh_metadata,
+                    store=store,
+                ),
+                count_only=count_only,
+                backend=backend,
+                session=stack.enter_context(
+                    open_session(
+                        Transport(keep_alive=keep_alive, compression=compression),
+                        concurrency=concurrency,
+                    )
+                ),
+            )
+
+        export_all(report, formats, output_dir=output_dir, prefix=prefix)
+
+
+@app.command()
+def batch(
+    config_paths: Annotated[
+        list[Path],
+        typer.Argument(
+            help="Configuration files or directories of them.",
+            show_default=False,
+            exists=True,
+        ),
+    ],
+    *,
+    url: Url = "https://gitlab.com",
+    access_token: AccessToken = None,
+    oauth_token: OAuthToken = None,
+    output_dir: OutputDir = Path.cwd(),
+    prefix: Prefix = datetime.now().strftime("%Y-%m-%d"),
+    formats: Formats = [Format.JSON],
+    ca_file: CAFile = None,
+    skip_ssl: SkipSSL = False,
+    concurrency: Concurrency = 8,
+    cache_dir: CacheDir = default_cache_dir(),
+    metadata_ttl: MetadataTTL = 24 * 7,
+    refresh_metadata: RefreshMetadata = False,
+    store: Store = False,
+    backend: BackendOption = Backend.REST,
+    workers: Annotated[
+        int,
         typer.Option(
-            "--version",
-            "-v",
-            help="Show version information and exit.",
-            callback=version_callback,
-            is_eager=True,
+            "--workers",
+            "-w",
+            help="Number of reports created and exported in parallel.",
+            min=1,
         ),
-    ] = False,
+    ] = 4,
+    keep_alive: KeepAlive = True,
+    compression: Compression = True,
+    profile: Profile = None,
 ) -> None:
-    """Create GitLab report."""
+    """Create GitLab reports from a single fetch of issues."""
+    config_files: list[Path] = []
+    for path in config_paths:
+        for config_file in sorted(path.glob("*.json")) if path.is_dir() else [path]:
+            if config_file.resolve() not in map(Path.resolve, config_files):
+                config_files.append(config_file)
+
+    # Reports are named after their configuration files.
+    names: dict[str, Path] = {}
+    for config_file in config_files:
+        if config_file.stem in names:
+            raise typer.BadParameter(
+                f"{names[config_file.stem]} and {config_file} would both write"
+                f" reports named {prefix}-{config_file.stem}",
+                param_hint="CONFIG_PATHS...",
+            )
+        names[config_file.stem] = config_file
+
+    configs = {config_file: _load_config(config_file) for config_file in config_files}
+
+    with _profile(profile):
+        with ExitStack() as stack:
+            issues = fetch_issues(
+                list(configs.values()),
+                url=url,
+                access_token=access_token,
+                oauth_token=oauth_token,
+                skip_ssl=skip_ssl,
+                ca_file=ca_file,
+                concurrency=concurrency,
+                **_open_caches(
+                    stack,
+                    cache_dir=cache_dir,
+                    url=url,
+                    metadata_ttl=metadata_ttl,
+                    refresh_metadata=refresh_metadata,
+                    store=store,
+                ),
+                backend=backend,
+                session=stack.enter_context(
+                    open_session(
+                        Transport(keep_alive=keep_alive, compression=compression),
+                        concurrency=concurrency,
+                    )
+                ),
+            )
+
+        def create(config_file: Path, config: ReportConfig) -> None:
+            export_all(
+                build_report(config, issues),
+                formats,
+                output_dir=output_dir,
+                prefix=f"{prefix}-{config_file.stem}",
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="report"
+        ) as executor:
+            for future in [
+                executor.submit(create, config_file, config)
+                for config_file, config in configs.items()
+            ]:
+                future.result()
+
+
+def _load_config(config_file: Path) -> ReportConfig:
+    """Load the report configuration from the file."""
     with config_file.open() as file:
-        config = ReportConfig(**json.load(file))
-
-    report = create_report(
-        config,
-        url=url,
-        access_token=access_token,
-        oauth_token=oauth_token,
-        skip_ssl=skip_ssl,
-        ca_file=ca_file,
-    )
+        return ReportConfig(**json.load(file))
 
-    for format in formats:
-        exporter = importlib.import_module(
-            f"gitlab_report.export.{format.name.lower()}"
+
+@contextmanager
+def _profile(path: Path | None) -> Iterator[None]:
+    """Profile the block if a file is given, writing the profile to it."""
+    if not path:
+        yield
+        return
+
+    with profiling.profile() as profiler:
+        yield
+    profiler.write(path)
+
+
+def _open_caches(
+    stack: ExitStack,
+    *,
+    cache_dir: Path,
+    url: str,
+    metadata_ttl: int,
+    refresh_metadata: bool,
+    store: bool,
+) -> dict[str, ProjectCache | IssueStore | None]:
+    """Open the on-disk caches, closing them with the stack."""
+    project_cache = stack.enter_context(
+        ProjectCache(
+            cache_dir / "projects.sqlite",
+            instance=url,
+            ttl=timedelta(hours=metadata_ttl),
+            refresh=refresh_metadata,
         )
-        exporter.export(report, output_dir=output_dir, prefix=prefix)
+    )
+    issue_store = (
+        stack.enter_context(IssueStore(cache_dir / "issues.sqlite", instance=url))
+        if store
+        else None
+    )
+    return {"project_cache": project_cache, "issue_store": issue_store}
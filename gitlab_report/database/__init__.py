@@ -1,4 +1,27 @@
+from enum import Enum
+
+from .cache import ProjectCache, default_cache_dir
 from .collections import Issues
 from .database import Database
+from .graphql import GraphQLDatabase
+from .store import IssueStore
+from .transport import Transport, open_session
+
+__all__ = [
+    "Backend",
+    "Database",
+    "GraphQLDatabase",
+    "IssueStore",
+    "Issues",
+    "ProjectCache",
+    "Transport",
+    "default_cache_dir",
+    "open_session",
+]
+
+
+class Backend(str, Enum):
+    """API used to fetch issues."""
 
-__all__ = ["Database", "Issues"]
+    REST = "rest"
+    GraphQL = "graphql"
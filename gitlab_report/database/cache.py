@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import time
+from datetime import timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Self
+
+from .models import Group, Project
+
+
+def default_cache_dir() -> Path:
+    """Get the default directory for the on-disk caches."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "gitlab-report"
+
+
+class ProjectCache:
+    """On-disk cache of project and namespace metadata backed by SQLite.
+
+    Entries expire after `ttl` and the cache is trimmed to `max_size` least
+    recently fetched projects when opened. With `refresh` enabled cached entries
+    are ignored, but freshly fetched metadata is still written to the cache.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        instance: str,
+        ttl: timedelta = timedelta(days=7),
+        max_size: int = 100_000,
+        refresh: bool = False,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._instance = instance
+        self._ttl = ttl.total_seconds()
+        self._refresh = refresh
+        self._lock = Lock()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS projects (
+                instance TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                namespace_id INTEGER NOT NULL,
+                namespace_name TEXT NOT NULL,
+                namespace_kind TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (instance, id)
+            )
+            """)
+        self.evict(max_size)
+
+    def get(self, project_id: int) -> tuple[Project, Group | None] | None:
+        """Get the project and its group if cached and not expired."""
+        if self._refresh:
+            return None
+
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT name, namespace_id, namespace_name, namespace_kind
+                FROM projects
+                WHERE instance = ? AND id = ? AND fetched_at >= ?
+                """,
+                (self._instance, project_id, time.time() - self._ttl),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        name, namespace_id, namespace_name, namespace_kind = row
+        return (
+            Project(id=project_id, name=name),
+            Group.from_namespace(
+                {"id": namespace_id, "name": namespace_name, "kind": namespace_kind}
+            ),
+        )
+
+    def put(self, project_id: int, name: str, namespace: dict[str, Any]) -> None:
+        """Store the project and its namespace."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._instance,
+                    project_id,
+                    name,
+                    namespace["id"],
+                    namespace["name"],
+                    namespace["kind"],
+                    time.time(),
+                ),
+            )
+
+    def evict(self, max_size: int) -> None:
+        """Remove expired entries and keep at most `max_size` latest ones."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM projects WHERE fetched_at < ?",
+                (time.time() - self._ttl,),
+            )
+            self._connection.execute(
+                """
+                DELETE FROM projects WHERE rowid NOT IN (
+                    SELECT rowid FROM projects ORDER BY fetched_at DESC LIMIT ?
+                )
+                """,
+                (max_size,),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
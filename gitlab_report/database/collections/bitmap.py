@@ -0,0 +1,43 @@
+"""Bitmaps of issue positions stored as Python integers.
+
+Bit `i` of a bitmap is set if the issue at position `i` is selected, so
+intersections, unions and counts run as single integer operations.
+"""
+
+from collections.abc import Iterable, Iterator
+from itertools import compress
+
+_FLAGS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def full(size: int) -> int:
+    """Create a bitmap selecting all positions."""
+    return (1 << size) - 1
+
+
+def from_flags(flags: bytes | bytearray) -> int:
+    """Create a bitmap from flags, a byte of either 0 or 1 per position."""
+    if not flags:
+        return 0
+    return int(flags[::-1].translate(_FLAGS_TO_DIGITS), 2)
+
+
+def from_positions(positions: Iterable[int], size: int) -> int:
+    """Create a bitmap selecting the positions."""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def to_flags(bitmap: int, size: int) -> bytes:
+    """Convert the bitmap to flags, a byte of either 0 or 1 per position."""
+    if not size:
+        return b""
+    return f"{bitmap:0{size}b}".encode()[::-1].translate(_DIGITS_TO_FLAGS)
+
+
+def positions(bitmap: int, size: int) -> Iterator[int]:
+    """Iterate over the selected positions."""
+    return compress(range(size), to_flags(bitmap, size))
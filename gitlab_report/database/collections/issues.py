@@ -1,9 +1,17 @@
+import heapq
+import time
+from collections.abc import Hashable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from functools import cached_property
+from typing import Any, NamedTuple
 
-from ..models import Group, Issue, IssueState, IssueType, Project, User
+from ..models import Issue, IssueState, IssueType
+from . import bitmap
+from .table import NO_TIME, IssueTable, ListColumn, ScalarColumn, timestamp
+
+DAY = 24 * 60 * 60
 
 
 class FilterKeyword(str, Enum):
@@ -13,6 +21,13 @@ class FilterKeyword(str, Enum):
     None_ = "None"
 
 
+class Criterion(NamedTuple):
+    """A single criterion of a filter with a normalised value."""
+
+    field: str
+    value: frozenset[Hashable] | FilterKeyword | bool | tuple[int | None, int | None]
+
+
 @dataclass(kw_only=True)
 class Filter:
     """Configuration for filtering issues."""
@@ -29,6 +44,40 @@ class Filter:
 
     overdue: bool | None = None
 
+    @cached_property
+    def criteria(self) -> tuple[Criterion, ...]:
+        """Get the criteria of the filter.
+
+        Criteria are compiled once per filter, so the filter must not be
+        modified afterwards.
+        """
+        criteria = []
+        for field in (
+            "type",
+            "state",
+            "author",
+            "assignee",
+            "label",
+            "group",
+            "project",
+        ):
+            value = getattr(self, field)
+            if not value:
+                continue
+
+            if not isinstance(value, set) and value in (
+                FilterKeyword.Any,
+                FilterKeyword.None_,
+            ):
+                criteria.append(Criterion(field, FilterKeyword(value)))
+            else:
+                criteria.append(Criterion(field, _keys(value)))
+
+        if self.overdue is not None:
+            criteria.append(Criterion("overdue", self.overdue))
+
+        return tuple(criteria)
+
 
 class GroupBy(str, Enum):
     """Grouping for the section."""
@@ -43,287 +92,232 @@ class GroupBy(str, Enum):
 
 
 class Issues:
-    """Collection of issues."""
+    """Collection of issues.
+
+    Issues are stored in a columnar table shared by all collections derived
+    from it, which only keep a bitmap of the selected issues. Filters are
+    evaluated as unions and intersections of bitmaps from the inverted indexes
+    of the table.
+
+    Each collection also keeps the set of criteria it was derived by, which
+    identifies it regardless of the order the filters were applied in. Results
+    of filters are cached in the table under these criteria, so sections,
+    groups and columns repeating the same filters are only evaluated once.
+    """
 
     def __init__(self, issues: list[Issue]) -> None:
-        self._issues = issues
+        self._table = IssueTable(issues)
+        self._bitmap = bitmap.full(len(issues))
+        self._criteria: frozenset[Criterion] = frozenset()
+
+    @classmethod
+    def _from_bitmap(
+        cls,
+        table: IssueTable,
+        selection: int,
+        criteria: frozenset[Criterion],
+    ) -> "Issues":
+        """Create a collection of the selected issues of the table."""
+        issues = cls.__new__(cls)
+        issues._table = table
+        issues._bitmap = selection
+        issues._criteria = criteria
+        return issues
 
     def total(self) -> int:
         """Count the number of issues."""
-        return len(self._issues)
-
-    def filter(self, filter: Filter) -> "Issues":
-        """Filter the issues."""
-        filters = [
-            Issues._filter_by_type,
-            Issues._filter_by_state,
-            Issues._filter_by_author,
-            Issues._filter_by_assignee,
-            Issues._filter_by_label,
-            Issues._filter_by_group,
-            Issues._filter_by_project,
-            Issues._filter_by_overdue,
-        ]
-
-        issues = self._issues
-        for filter_fn in filters:
-            issues = filter_fn(issues, filter)
-
-        return Issues(issues)
-
-    @staticmethod
-    def _filter_by_type(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by type."""
-        if not filter.type:
-            return issues
-
-        if isinstance(filter.type, set):
-            return [issue for issue in issues if issue.type in filter.type]
-
-        return [issue for issue in issues if issue.type == filter.type]
-
-    @staticmethod
-    def _filter_by_state(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by state."""
-        if not filter.state:
-            return issues
-
-        if isinstance(filter.state, set):
-            return [issue for issue in issues if issue.state in filter.state]
-
-        return [issue for issue in issues if issue.state == filter.state]
-
-    @staticmethod
-    def _filter_by_author(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by author."""
-        if not filter.author:
-            return issues
-
-        if isinstance(filter.author, set):
-            return [issue for issue in issues if issue.author.id in filter.author]
-
-        return [issue for issue in issues if issue.author.id == filter.author]
-
-    @staticmethod
-    def _filter_by_assignee(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by assignee."""
-        if not filter.assignee:
-            return issues
-
-        if isinstance(filter.assignee, set):
-            return [
-                issue
-                for issue in issues
-                if any(assignee.id in filter.assignee for assignee in issue.assignees)
-            ]
-
-        if filter.assignee == FilterKeyword.Any:
-            return [issue for issue in issues if issue.assignees]
-
-        if filter.assignee == FilterKeyword.None_:
-            return [issue for issue in issues if not issue.assignees]
-
-        return [
-            issue
-            for issue in issues
-            if any(assignee.id == filter.assignee for assignee in issue.assignees)
-        ]
-
-    @staticmethod
-    def _filter_by_label(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by label."""
-        if not filter.label:
-            return issues
-
-        if isinstance(filter.label, set):
-            return [
-                issue
-                for issue in issues
-                if any(label in issue.labels for label in filter.label)
-            ]
-
-        if filter.label == FilterKeyword.Any:
-            return [issue for issue in issues if issue.labels]
-
-        if filter.label == FilterKeyword.None_:
-            return [issue for issue in issues if not issue.labels]
-
-        return [
-            issue
-            for issue in issues
-            if any(label == filter.label for label in issue.labels)
-        ]
-
-    @staticmethod
-    def _filter_by_group(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by group."""
-        if not filter.group:
-            return issues
-
-        if isinstance(filter.group, set):
-            return [
-                issue
-                for issue in issues
-                if issue.group and issue.group.id in filter.group
-            ]
-
-        if filter.group == FilterKeyword.Any:
-            return [issue for issue in issues if issue.group]
-
-        if filter.group == FilterKeyword.None_:
-            return [issue for issue in issues if not issue.group]
+        return self._bitmap.bit_count()
 
+    def ids(self) -> list[int]:
+        """Get the IDs of the issues."""
         return [
-            issue for issue in issues if issue.group and issue.group.id == filter.group
+            self._table.id[position]
+            for position in bitmap.positions(self._bitmap, self._table.size)
         ]
 
-    @staticmethod
-    def _filter_by_project(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by project."""
-        if not filter.project:
-            return issues
-
-        if isinstance(filter.project, set):
-            return [issue for issue in issues if issue.project.id in filter.project]
-
-        return [issue for issue in issues if issue.project.id == filter.project]
+    def filter(self, filter: Filter) -> "Issues":
+        """Filter the issues.
+
+        The most selective criteria are evaluated first, and evaluation stops as
+        soon as no issues are left.
+        """
+        return self._derive(filter.criteria)
+
+    def period(
+        self,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> "Issues":
+        """Get the issues created in the period, bounds included.
+
+        Periods are sliced from the index of the issues ordered by creation, so
+        reports of different periods can share a single collection of issues.
+        """
+        criterion = Criterion(
+            "created_at",
+            (
+                timestamp(created_after) if created_after else None,
+                timestamp(created_before) if created_before else None,
+            ),
+        )
+        return self._derive([criterion])
+
+    def _derive(self, criteria: Iterable[Criterion]) -> "Issues":
+        """Get the issues matching all the criteria."""
+        criteria = self._criteria.union(criteria)
+        selection = self._table.result(criteria)
+        if selection is None:
+            selection = self._bitmap
+            for criterion in sorted(criteria - self._criteria, key=self._estimate):
+                if not selection:
+                    break
+                selection &= self._match(criterion)
+            self._table.store(criteria, selection)
+
+        return Issues._from_bitmap(self._table, selection, criteria)
+
+    def _estimate(self, criterion: Criterion) -> int:
+        """Estimate the number of issues of the table matching the criterion."""
+        field, value = criterion
+
+        if field == "overdue":
+            # Overdue state is not indexed, so it is evaluated last.
+            return self._table.size + 1
+
+        if isinstance(value, FilterKeyword) or field == "created_at":
+            return self._match(criterion).bit_count()
+
+        return self._column(field).count(value)
+
+    def _match(self, criterion: Criterion) -> int:
+        """Get the bitmap of issues of the table matching the criterion."""
+        field, value = criterion
+        table = self._table
+
+        if field == "overdue":
+            return table.cached(criterion, lambda: Issues._overdue(table, value))
+
+        if field == "created_at":
+            return table.cached(criterion, lambda: table.created_between(*value))
+
+        if field in ("assignee", "label"):
+            column = self._column(field)
+            if value == FilterKeyword.Any:
+                return column.any
+            if value == FilterKeyword.None_:
+                return column.none
+
+        if field == "group":
+            if value == FilterKeyword.Any:
+                return table.groups_any
+            if value == FilterKeyword.None_:
+                return table.groups_none
+
+        return table.cached(criterion, lambda: self._column(field).mask(value))
+
+    def _column(self, field: str) -> ScalarColumn | ListColumn:
+        """Get the column of the table for the filter field."""
+        return {
+            "type": self._table.type,
+            "state": self._table.state,
+            "author": self._table.author,
+            "assignee": self._table.assignees,
+            "label": self._table.labels,
+            "group": self._table.group,
+            "project": self._table.project,
+        }[field]
 
     @staticmethod
-    def _filter_by_overdue(issues: list[Issue], filter: Filter) -> list[Issue]:
-        """Filter the issues by outdated state."""
-        if filter.overdue is None:
-            return issues
-
-        today = datetime.now().isoformat()
-
-        if filter.overdue:
-            return [
-                issue
-                for issue in issues
-                if (
-                    issue.state == IssueState.Opened
-                    and issue.due_date
-                    and issue.due_date < today
+    def _overdue(table: IssueTable, overdue: bool) -> int:
+        """Get the bitmap of issues of the table matching the overdue state.
+
+        Issues are overdue if they were closed, or are still open, after the
+        end of their due date.
+        """
+        now = int(time.time())
+        opened = bitmap.to_flags(table.state.mask([IssueState.Opened]), table.size)
+
+        mask = bitmap.from_flags(
+            bytes(
+                due_date != NO_TIME
+                and (
+                    closed_at >= due_date + DAY
+                    if closed_at != NO_TIME
+                    else is_opened and now >= due_date + DAY
                 )
-                or (
-                    issue.closed_at
-                    and issue.due_date
-                    and issue.due_date < issue.closed_at
+                for due_date, closed_at, is_opened in zip(
+                    table.due_date, table.closed_at, opened
                 )
-            ]
+            )
+        )
 
-        return [
-            issue
-            for issue in issues
-            if not issue.due_date
-            or (issue.state == IssueState.Opened and issue.due_date > today)
-            or (issue.closed_at and issue.due_date > issue.closed_at)
-        ]
+        return mask if overdue else bitmap.full(table.size) & ~mask
 
     def group_by(self, group_by: GroupBy) -> "dict[Any, Issues]":
         """Group the issues by the specified type."""
-        groupings = {
-            GroupBy.Group: self._group_by_group,
-            GroupBy.Project: self._group_by_project,
-            GroupBy.Author: self._group_by_author,
-            GroupBy.Assignee: self._group_by_assignee,
-            GroupBy.Label: self._group_by_label,
-            GroupBy.Type: self._group_by_type,
-            GroupBy.State: self._group_by_state,
-        }
-
-        groups = groupings[group_by]()
-        return {group: Issues(issues) for group, issues in groups.items()}
-
-    def _group_by_group(self) -> dict[Group, list[Issue]]:
-        """Group the issues by group."""
-        groups = {}
-        for issue in self._issues:
-            if issue.group not in groups:
-                groups[issue.group] = []
-
-            groups[issue.group].append(issue)
-
-        return groups
-
-    def _group_by_project(self) -> dict[Project, list[Issue]]:
-        """Group the issues by project."""
-        groups: dict[Project, list[Issue]] = {}
-        for issue in self._issues:
-            if issue.project not in groups:
-                groups[issue.project] = []
-
-            groups[issue.project].append(issue)
-
-        return groups
-
-    def _group_by_author(self) -> dict[User, list[Issue]]:
-        """Group the issues by author."""
-        groups: dict[User, list[Issue]] = {}
-        for issue in self._issues:
-            if issue.author not in groups:
-                groups[issue.author] = []
-
-            groups[issue.author].append(issue)
+        # Grouping fields are named after the filter fields.
+        field = group_by.value
+        column = self._column(field)
 
-        return groups
-
-    def _group_by_assignee(self) -> dict[User | None, list[Issue]]:
-        """Group the issues by assignee."""
-        groups: dict[User | None, list[Issue]] = {}
-        for issue in self._issues:
-            if not issue.assignees:
-                if None not in groups:
-                    groups[None] = []
-
-                groups[None].append(issue)
-                continue
-
-            for assignee in issue.assignees:
-                if assignee not in groups:
-                    groups[assignee] = []
-
-                groups[assignee].append(issue)
-
-        return groups
-
-    def _group_by_type(self) -> dict[IssueType, list[Issue]]:
-        """Group the issues by type."""
-        groups: dict[IssueType, list[Issue]] = {}
-        for issue in self._issues:
-            if issue.type not in groups:
-                groups[issue.type] = []
-
-            groups[issue.type].append(issue)
-
-        return groups
-
-    def _group_by_state(self) -> dict[IssueState, list[Issue]]:
-        """Group the issues by state."""
-        groups: dict[IssueState, list[Issue]] = {}
-        for issue in self._issues:
-            if issue.state not in groups:
-                groups[issue.state] = []
-
-            groups[issue.state].append(issue)
+        groups = {}
+        for group, positions in column.group(
+            bitmap.positions(self._bitmap, self._table.size)
+        ).items():
+            if group is None and isinstance(column, ListColumn):
+                criterion = Criterion(field, FilterKeyword.None_)
+            else:
+                criterion = Criterion(field, frozenset([column.key(group)]))
+
+            criteria = self._criteria | {criterion}
+            selection = self._table.result(criteria)
+            if selection is None:
+                selection = bitmap.from_positions(positions, self._table.size)
+                self._table.store(criteria, selection)
+
+            groups[group] = Issues._from_bitmap(self._table, selection, criteria)
 
         return groups
 
-    def _group_by_label(self) -> dict[str | None, list[Issue]]:
-        """Group the issues by label."""
-        groups: dict[str | None, list[Issue]] = {}
-        for issue in self._issues:
-            if not issue.labels:
-                if None not in groups:
-                    groups[None] = []
-
-                groups[None].append(issue)
-                continue
-
-            for label in issue.labels:
-                if label not in groups:
-                    groups[label] = []
-
-                groups[label].append(issue)
-
-        return groups
+    def cube(
+        self,
+        group_by: GroupBy,
+        filters: list[Filter],
+        *,
+        limit: int | None = None,
+    ) -> "dict[Any, list[int]]":
+        """Count the issues of each group matching each of the filters.
+
+        Unlike filtering the groups one by one, the whole matrix of counts is
+        filled in a single scan of the issues. Counts of each group are listed
+        as the total of the group followed by the count for each filter, and
+        groups are ordered from the largest one.
+
+        If a limit is set, only the largest groups are counted. They are picked
+        by a first scan counting the group sizes only, and the filters are then
+        only counted for the issues of these groups.
+        """
+        column = self._column(group_by.value)
+        masks = [self.filter(filter)._bitmap for filter in filters]
+
+        if limit is None:
+            counts = column.cube(self._bitmap, masks)
+            top = sorted(counts, key=lambda group: counts[group][0], reverse=True)
+            return {group: counts[group] for group in top}
+
+        sizes = column.cube(self._bitmap, [])
+        top = heapq.nlargest(limit, sizes, key=lambda group: sizes[group][0])
+
+        selection = 0
+        for group in top:
+            if group is None and isinstance(column, ListColumn):
+                selection |= column.none
+            else:
+                selection |= column.mask([column.key(group)])
+
+        counts = column.cube(self._bitmap & selection, masks)
+        return {group: counts[group] for group in top}
+
+
+def _keys(value: Any) -> frozenset[Hashable]:
+    """Get the keys of the filter value."""
+    return frozenset(value) if isinstance(value, set) else frozenset([value])
@@ -0,0 +1,341 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from datetime import datetime, timezone
+from itertools import compress, repeat
+from threading import Lock
+from typing import Any, Generic, TypeVar
+
+from ..models import Issue
+from . import bitmap
+
+T = TypeVar("T")
+
+RESULT_CACHE_SIZE = 256
+
+NO_TIME = -(2**63)
+
+_SELECTED = bytes(value & 1 for value in range(256))
+
+
+class _IndexedColumn(Generic[T]):
+    """Dictionary of column values with an inverted index per value."""
+
+    size: int
+
+    def __init__(self, key: Callable[[T], Hashable]) -> None:
+        self.key = key
+        self.values: list[T] = []
+        self._codes_by_key: dict[Hashable, int] = {}
+        self._postings: list[array[int]] = []
+        self._bitmaps: dict[int, int] = {}
+
+    def _encode(self, key: Hashable, value: T, row: int) -> int:
+        """Get the code of the value, indexing the row under it."""
+        code = self._codes_by_key.setdefault(key, len(self.values))
+        if code == len(self.values):
+            self.values.append(value)
+            self._postings.append(array("L"))
+        self._postings[code].append(row)
+        return code
+
+    def mask(self, keys: Iterable[Hashable]) -> int:
+        """Get the bitmap of issues with any of the values."""
+        mask = 0
+        for key in keys:
+            if key in self._codes_by_key:
+                mask |= self._bitmap(self._codes_by_key[key])
+        return mask
+
+    def count(self, keys: Iterable[Hashable]) -> int:
+        """Count issues with any of the values, counting issues once per value."""
+        return sum(
+            len(self._postings[self._codes_by_key[key]])
+            for key in keys
+            if key in self._codes_by_key
+        )
+
+    def _bitmap(self, code: int) -> int:
+        """Get the bitmap of issues with the value."""
+        if code not in self._bitmaps:
+            self._bitmaps[code] = bitmap.from_positions(self._postings[code], self.size)
+        return self._bitmaps[code]
+
+
+class ScalarColumn(_IndexedColumn[T]):
+    """Dictionary-encoded column with a single value per issue.
+
+    Values are identified by keys, e.g. users by their IDs. Columns with at most
+    256 distinct values store codes as bytes. Each value has an inverted index
+    of the issue positions with that value, which is turned into a bitmap the
+    first time the value is filtered by.
+    """
+
+    def __init__(self, values: Iterable[T], key: Callable[[T], Hashable]) -> None:
+        super().__init__(key)
+
+        codes = array("L")
+        for row, value in enumerate(values):
+            codes.append(self._encode(key(value), value, row))
+
+        self.size = len(codes)
+        self.codes: array[int] | bytes = (
+            bytes(codes.tolist()) if len(self.values) <= 256 else codes
+        )
+
+    def group(self, positions: Iterable[int]) -> dict[T, list[int]]:
+        """Group the issue positions by their values."""
+        groups: dict[int, list[int]] = {}
+        for position in positions:
+            code = self.codes[position]
+            if code not in groups:
+                groups[code] = []
+
+            groups[code].append(position)
+
+        return {self.values[code]: group for code, group in groups.items()}
+
+    def cube(self, selection: int, masks: list[int]) -> dict[T, list[int]]:
+        """Count the selected issues of each value matching each of the masks.
+
+        Counts are computed in a single scan of the selected issues and listed
+        as the total of the value followed by the count for each mask.
+        """
+        cells = _cells(self.codes, _pack(selection, masks, self.size))
+        return {
+            self.values[code]: counts
+            for code, counts in _aggregate(cells, len(masks)).items()
+        }
+
+
+class ListColumn(_IndexedColumn[T]):
+    """Dictionary-encoded column with a list of values per issue.
+
+    Lists are stored in CSR layout: values of the issue at position `i` are
+    `codes[offsets[i]:offsets[i + 1]]`. Each value has an inverted index of the
+    issue positions with that value, which is turned into a bitmap the first
+    time the value is filtered by. Bitmaps of issues with any and with no
+    values are precomputed.
+    """
+
+    def __init__(self, values: Iterable[list[T]], key: Callable[[T], Hashable]) -> None:
+        super().__init__(key)
+
+        self.offsets = array("L", [0])
+        self.codes = array("L")
+        for row, row_values in enumerate(values):
+            for value in row_values:
+                self.codes.append(self._encode(key(value), value, row))
+            self.offsets.append(len(self.codes))
+
+        self.size = len(self.offsets) - 1
+        self.any = bitmap.from_flags(
+            bytes(map(int.__lt__, self.offsets[:-1], self.offsets[1:]))
+        )
+        self.none = bitmap.full(self.size) & ~self.any
+        self._entries: tuple[array[int], array[int]] | None = None
+
+    @property
+    def entries(self) -> tuple[array, array]:
+        """Get the positions and codes of the values of all issues.
+
+        Issues without values have a single entry with the code -1.
+        """
+        if self._entries is None:
+            rows, codes = array("L"), array("l")
+            for row in range(self.size):
+                start, end = self.offsets[row], self.offsets[row + 1]
+                if start == end:
+                    rows.append(row)
+                    codes.append(-1)
+                else:
+                    rows.extend(repeat(row, end - start))
+                    codes.extend(self.codes[start:end].tolist())
+            self._entries = rows, codes
+        return self._entries
+
+    def group(self, positions: Iterable[int]) -> dict[T | None, list[int]]:
+        """Group the issue positions by each of their values.
+
+        Issues without values are grouped under `None`.
+        """
+        groups: dict[int | None, list[int]] = {}
+        for position in positions:
+            codes = self.codes[self.offsets[position] : self.offsets[position + 1]]
+            for code in codes or [None]:
+                if code not in groups:
+                    groups[code] = []
+
+                groups[code].append(position)
+
+        return {
+            self.values[code] if code is not None else None: group
+            for code, group in groups.items()
+        }
+
+    def cube(self, selection: int, masks: list[int]) -> dict[T | None, list[int]]:
+        """Count the selected issues of each value matching each of the masks.
+
+        Counts are computed in a single scan of the values of the selected
+        issues and listed as the total of the value followed by the count for
+        each mask. Issues without values are counted under `None`.
+        """
+        rows, codes = self.entries
+        packed = [
+            bytes(map(flags.__getitem__, rows))
+            for flags in _pack(selection, masks, self.size)
+        ]
+        cells = _cells(codes, packed)
+        return {
+            self.values[code] if code >= 0 else None: counts
+            for code, counts in _aggregate(cells, len(masks)).items()
+        }
+
+
+class IssueTable:
+    """Columnar representation of issues with inverted indexes.
+
+    Timestamps are parsed once into seconds since the epoch, with `NO_TIME` for
+    missing ones, and positions of the issues are indexed in the order of their
+    creation, so periods are sliced from the index by bisection.
+
+    Besides the bitmaps of single criteria, the table caches the bitmaps of the
+    collections derived from it by their full set of criteria. Since these are
+    as many as there are sections, groups and columns, only the most recently
+    used ones are kept. The cache is shared by threads evaluating reports from
+    the same table.
+    """
+
+    def __init__(
+        self, issues: list[Issue], *, cache_size: int = RESULT_CACHE_SIZE
+    ) -> None:
+        self.size = len(issues)
+
+        self.id = array("Q", [issue.id for issue in issues])
+
+        self.type = ScalarColumn([issue.type for issue in issues], key=_identity)
+        self.state = ScalarColumn([issue.state for issue in issues], key=_identity)
+        self.author = ScalarColumn([issue.author for issue in issues], key=_id)
+        self.group = ScalarColumn([issue.group for issue in issues], key=_id)
+        self.project = ScalarColumn([issue.project for issue in issues], key=_id)
+
+        self.assignees = ListColumn([issue.assignees for issue in issues], key=_id)
+        self.labels = ListColumn([issue.labels for issue in issues], key=_identity)
+
+        self.groups_none = self.group.mask([None])
+        self.groups_any = bitmap.full(self.size) & ~self.groups_none
+
+        self.created_at = _timestamps(issue.created_at for issue in issues)
+        self.closed_at = _timestamps(issue.closed_at for issue in issues)
+        self.due_date = _timestamps(issue.due_date for issue in issues)
+
+        self.created_order = array(
+            "L", sorted(range(self.size), key=self.created_at.__getitem__)
+        )
+        self._created_sorted = array(
+            "q", map(self.created_at.__getitem__, self.created_order)
+        )
+
+        self._masks: dict[Hashable, int] = {}
+        self._results: OrderedDict[Hashable, int] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = Lock()
+
+    def cached(self, key: Hashable, compute: Callable[[], int]) -> int:
+        """Get the bitmap for the key, computing it on the first call."""
+        if key not in self._masks:
+            self._masks[key] = compute()
+        return self._masks[key]
+
+    def created_between(self, after: int | None, before: int | None) -> int:
+        """Get the bitmap of issues created in the period, bounds included."""
+        start = bisect_left(self._created_sorted, after) if after is not None else 0
+        end = (
+            bisect_right(self._created_sorted, before)
+            if before is not None
+            else self.size
+        )
+        return bitmap.from_positions(self.created_order[start:end], self.size)
+
+    def result(self, key: Hashable) -> int | None:
+        """Get the cached bitmap of the derived collection, if any."""
+        with self._lock:
+            selection = self._results.get(key)
+            if selection is not None:
+                self._results.move_to_end(key)
+            return selection
+
+    def store(self, key: Hashable, selection: int) -> None:
+        """Cache the bitmap of the derived collection, evicting the oldest one."""
+        with self._lock:
+            self._results[key] = selection
+            self._results.move_to_end(key)
+            if len(self._results) > self._cache_size:
+                self._results.popitem(last=False)
+
+
+def _pack(selection: int, masks: list[int], size: int) -> list[bytes]:
+    """Pack the flags of the selection and the masks into bytes per position.
+
+    The lowest bit of the first bytes flags the selection and the following
+    bits the masks, so all flags of a position are compared at once.
+    """
+    flags = [selection, *masks]
+    packed = []
+    for start in range(0, len(flags), 8):
+        value = 0
+        for bit, mask in enumerate(flags[start : start + 8]):
+            value |= int.from_bytes(bitmap.to_flags(mask, size), "little") << bit
+        packed.append(value.to_bytes(size, "little"))
+    return packed
+
+
+def _cells(codes: Iterable[int], packed: list[bytes]) -> Counter:
+    """Count the selected positions by their code and packed flags."""
+    selected = packed[0].translate(_SELECTED)
+    signatures = packed[0] if len(packed) == 1 else zip(*packed)
+    return Counter(zip(compress(codes, selected), compress(signatures, selected)))
+
+
+def _aggregate(cells: Counter, width: int) -> dict[int, list[int]]:
+    """Sum the counts of the cells per code, for the selection and each mask."""
+    counts: dict[int, list[int]] = {}
+    for (code, signature), count in cells.items():
+        if not isinstance(signature, int):
+            signature = int.from_bytes(bytes(signature), "little")
+
+        if code not in counts:
+            counts[code] = [0] * (width + 1)
+
+        for i in range(width + 1):
+            if signature >> i & 1:
+                counts[code][i] += count
+    return counts
+
+
+def timestamp(value: str | datetime | None) -> int:
+    """Convert the ISO date or datetime to seconds since the epoch.
+
+    Values without a time zone, including dates, are in UTC like GitLab ones.
+    """
+    if not value:
+        return NO_TIME
+
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not value.tzinfo:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _timestamps(values: Iterable[str | None]) -> array:
+    return array("q", map(timestamp, values))
+
+
+def _identity(value: Any) -> Hashable:
+    return value
+
+
+def _id(value: Any) -> Hashable:
+    return value.id if value is not None else None
@@ -0,0 +1,44 @@
+from .collections import Issues
+from .collections.issues import Filter
+from .database import Database
+from .planner import Query, exact_query
+
+
+class IssueCounter:
+    """Counter of issues matching filters.
+
+    Issues are counted by the API whenever the filters can be expressed as an
+    API query, otherwise they are fetched once and counted locally.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        *,
+        queries: list[Query] | None = None,
+        **kwargs,
+    ) -> None:
+        self._db = db
+        self._queries = queries
+        self._kwargs = kwargs
+        self._issues: Issues | None = None
+
+    def count(self, filters: list[Filter]) -> int:
+        """Count issues matching all the filters."""
+        if self._issues is None:
+            query = exact_query(filters)
+            if query:
+                total = self._db.count_issues(query=query, **self._kwargs)
+                if total is not None:
+                    return total
+
+        issues = self.issues()
+        for filter in filters:
+            issues = issues.filter(filter)
+        return issues.total()
+
+    def issues(self) -> Issues:
+        """Get all issues, fetching them on the first call."""
+        if self._issues is None:
+            self._issues = self._db.get_issues(queries=self._queries, **self._kwargs)
+        return self._issues
@@ -1,15 +1,50 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Self
+from typing import Any, Self
 
 import gitlab
 import gitlab.base
+import requests
 
+from .. import profiling
+from .cache import ProjectCache
 from .collections import Issues
-from .models import Issue
+from .models import Issue, Registry
+from .planner import Query
+from .resolver import ProjectResolver
+from .scheduler import ScheduledSession
+from .store import IssueStore
+from .transport import open_session
+
+# Margin of the high-water mark of the issue store for clocks out of sync.
+SYNC_CLOCK_SKEW = timedelta(minutes=5)
+
+
+class _Gitlab(gitlab.Gitlab):
+    """GitLab client leaving retries of throttled requests to scheduled sessions.
+
+    Otherwise each retry of the session would be retried again by the client.
+    """
+
+    def http_request(self, *args: Any, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault(
+            "obey_rate_limit", not isinstance(self.session, ScheduledSession)
+        )
+        return super().http_request(*args, **kwargs)
 
 
 class Database:
-    """Database abstraction for GitLab."""
+    """Database abstraction for GitLab.
+
+    Users, groups, projects and labels of all issues fetched by the database
+    are shared instances from its registry.
+
+    Databases can share a session, e.g. one per process, so connections to
+    GitLab are reused across reports. A shared session is not closed with the
+    database.
+    """
 
     def __init__(
         self,
@@ -20,33 +55,150 @@ class Database:
         ca_file: Path | None = None,
         skip_ssl: bool = False,
         debug: bool = False,
+        concurrency: int = 8,
+        cache: ProjectCache | None = None,
+        store: IssueStore | None = None,
+        session: requests.Session | None = None,
     ) -> None:
-        self._gitlab = gitlab.Gitlab(
+        self._cache = cache
+        self._store = store
+        self._owns_session = session is None
+        self._gitlab = _Gitlab(
             url=url,
             private_token=access_token,
             oauth_token=oauth_token,
             ssl_verify=str(ca_file) if ca_file else not skip_ssl,
+            session=session or open_session(concurrency=concurrency),
         )
 
         if debug:
             self._gitlab.enable_debug()
 
-        self._gitlab.auth()
+        profiling.instrument(self._gitlab.session)
+        with profiling.span("auth"):
+            self._gitlab.auth()
 
-    def get_issues(self, **kwargs) -> Issues:
-        issues = self._gitlab.issues.list(get_all=True, **kwargs)
+        self._registry = Registry()
+        self._projects = ProjectResolver(
+            self._gitlab,
+            concurrency=concurrency,
+            cache=cache,
+            registry=self._registry,
+        )
+
+    def get_issues(self, *, queries: list[Query] | None = None, **kwargs) -> Issues:
+        """Get issues matching any of the queries.
+
+        Queries are ignored when the database has a local issue store, since it
+        already holds all issues.
+        """
+        if self._store:
+            self.sync()
+            return Issues(
+                list(self._store.iter_issues(registry=self._registry, **kwargs))
+            )
+
+        if not queries or len(queries) == 1:
+            query = queries[0] if queries else None
+            return Issues(list(self.iter_issues(query=query, **kwargs)))
 
-        projects = {}
-        for issue in issues:
-            if issue.project_id not in projects:
-                projects[issue.project_id] = self._gitlab.projects.get(issue.project_id)
+        issues = {}
+        for query in queries:
+            for issue in self.iter_issues(query=query, **kwargs):
+                issues.setdefault(issue.id, issue)
 
+        # Restore the default order of the issues API.
         return Issues(
-            [Issue.from_gitlab(issue, projects[issue.project_id]) for issue in issues]
+            sorted(
+                issues.values(),
+                key=lambda issue: (issue.created_at, issue.id),
+                reverse=True,
+            )
         )
 
+    def sync(self) -> int:
+        """Synchronise the local issue store with GitLab.
+
+        Only issues updated after the high-water mark of the store are fetched.
+        The mark then advances to the start of the sync, less a margin for the
+        clock skew between this machine and GitLab.
+        """
+        if not self._store:
+            raise ValueError("database has no local issue store")
+
+        mark = self._store.high_water_mark
+        started = datetime.now(timezone.utc) - SYNC_CLOCK_SKEW
+        with profiling.span("sync") as span:
+            span["issues"] = self._store.upsert(
+                self.iter_issues(**({"updated_after": mark} if mark else {})),
+                mark=started,
+            )
+        return span["issues"]
+
+    def iter_issues(
+        self,
+        *,
+        query: Query | None = None,
+        per_page: int = 100,
+        **kwargs,
+    ) -> Iterator[Issue]:
+        """Stream issues page by page.
+
+        Projects of a page are resolved while the next page is fetched, and raw
+        GitLab objects are dropped as soon as their page has been converted, so
+        memory use scales with the page size rather than the number of issues.
+        """
+        issues = self._list(query, per_page=per_page, **kwargs)
+
+        pending: list[gitlab.base.RESTObject] = []
+        while page := list(islice(issues, per_page)):
+            for issue in page:
+                self._projects.submit(issue.project_id)
+
+            for issue in pending:
+                yield Issue.from_gitlab(
+                    issue, *self._projects.get(issue.project_id), self._registry
+                )
+
+            pending = page
+
+        for issue in pending:
+            yield Issue.from_gitlab(
+                issue, *self._projects.get(issue.project_id), self._registry
+            )
+
+    def count_issues(self, *, query: Query | None = None, **kwargs) -> int | None:
+        """Count issues matching the query using the total reported by the API.
+
+        Returns `None` if the database has a local issue store or the API does
+        not report the total, e.g. for more than 10,000 issues on GitLab.com.
+        """
+        if self._store:
+            return None
+
+        return self._list(query, per_page=1, **kwargs).total
+
+    def _list(self, query: Query | None, **kwargs) -> gitlab.base.RESTObjectList:
+        """List issues matching the query from the matching API endpoint."""
+        params = dict(query.params) if query else {}
+
+        if query and query.project:
+            manager = self._gitlab.projects.get(query.project, lazy=True).issues
+        elif query and query.group:
+            manager = self._gitlab.groups.get(query.group, lazy=True).issues
+        else:
+            manager = self._gitlab.issues
+
+        if query and (query.project or query.group):
+            # Keep the default scope of the instance-wide issues endpoint.
+            params["scope"] = "created_by_me"
+
+        return manager.list(iterator=True, **(params | kwargs))
+
     def close(self) -> None:
-        self._gitlab.session.close()
+        self._projects.close()
+        if self._owns_session:
+            self._gitlab.session.close()
 
     def __enter__(self) -> Self:
         return self
@@ -0,0 +1,195 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any
+
+import gitlab.exceptions
+
+from .collections import Issues
+from .database import Database
+from .models import Group, Issue, Project
+from .models.issue import global_id
+from .planner import Query
+
+ISSUES_QUERY = """
+query Issues(
+  $first: Int!
+  $after: String
+  $authorUsername: String
+  $createdAfter: Time
+  $createdBefore: Time
+  $updatedAfter: Time
+) {
+  issues(
+    first: $first
+    after: $after
+    authorUsername: $authorUsername
+    createdAfter: $createdAfter
+    createdBefore: $createdBefore
+    updatedAfter: $updatedAfter
+    sort: CREATED_DESC
+  ) {
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
+    nodes {
+      id
+      type
+      state
+      projectId
+      createdAt
+      updatedAt
+      closedAt
+      dueDate
+      author {
+        id
+        name
+      }
+      assignees {
+        nodes {
+          id
+          name
+        }
+      }
+      labels {
+        nodes {
+          title
+        }
+      }
+    }
+  }
+}
+"""
+
+PROJECTS_QUERY = """
+query Projects($ids: [ID!], $first: Int!) {
+  projects(ids: $ids, first: $first) {
+    nodes {
+      id
+      name
+      namespace {
+        id
+        name
+      }
+      group {
+        id
+      }
+    }
+  }
+}
+"""
+
+MAX_PAGE_SIZE = 100
+
+
+class GraphQLDatabase(Database):
+    """Database abstraction for GitLab fetching issues over GraphQL.
+
+    Only the issue fields used by the report are requested, and projects of a
+    page are resolved with a single batched query instead of a request per
+    project.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._project_metadata: dict[int, tuple[Project, Group | None]] = {}
+
+    def get_issues(self, *, queries: list[Query] | None = None, **kwargs) -> Issues:
+        # Planned queries are not mapped to GraphQL arguments, so issues of the
+        # whole period are fetched once and filtered locally.
+        return super().get_issues(**kwargs)
+
+    def iter_issues(
+        self,
+        *,
+        query: Query | None = None,
+        per_page: int = MAX_PAGE_SIZE,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        updated_after: datetime | str | None = None,
+    ) -> Iterator[Issue]:
+        """Stream issues page by page using cursor pagination.
+
+        The query is ignored, issues are expected to be filtered locally.
+        """
+        variables = {
+            "first": min(per_page, MAX_PAGE_SIZE),
+            # Match the default scope of the REST issues endpoint.
+            "authorUsername": self._gitlab.user.username,
+            "createdAfter": _format_time(created_after),
+            "createdBefore": _format_time(created_before),
+            "updatedAfter": _format_time(updated_after),
+        }
+
+        while True:
+            issues = self._execute(ISSUES_QUERY, variables)["issues"]
+
+            projects = self._resolve_projects(
+                {issue["projectId"] for issue in issues["nodes"]}
+            )
+            for issue in issues["nodes"]:
+                yield Issue.from_graphql(
+                    issue, *projects[issue["projectId"]], self._registry
+                )
+
+            if not issues["pageInfo"]["hasNextPage"]:
+                break
+            variables["after"] = issues["pageInfo"]["endCursor"]
+
+    def count_issues(self, *, query: Query | None = None, **kwargs) -> int | None:
+        # Queries are not mapped to GraphQL arguments, so issues are always
+        # counted locally.
+        return None
+
+    def _resolve_projects(
+        self, project_ids: set[int]
+    ) -> dict[int, tuple[Project, Group | None]]:
+        """Resolve the projects and their groups, fetching unknown ones."""
+        missing = []
+        for project_id in project_ids - self._project_metadata.keys():
+            cached = self._cache.get(project_id) if self._cache else None
+            if cached:
+                self._project_metadata[project_id] = self._registry.intern(*cached)
+            else:
+                missing.append(f"gid://gitlab/Project/{project_id}")
+
+        for i in range(0, len(missing), MAX_PAGE_SIZE):
+            ids = missing[i : i + MAX_PAGE_SIZE]
+            projects = self._execute(PROJECTS_QUERY, {"ids": ids, "first": len(ids)})
+
+            for project in projects["projects"]["nodes"]:
+                project_id = global_id(project["id"])
+                namespace = {
+                    "id": global_id(project["namespace"]["id"]),
+                    "name": project["namespace"]["name"],
+                    "kind": "group" if project["group"] else "user",
+                }
+
+                if self._cache:
+                    self._cache.put(project_id, project["name"], namespace)
+
+                self._project_metadata[project_id] = self._registry.intern(
+                    Project(id=project_id, name=project["name"]),
+                    Group.from_namespace(namespace),
+                )
+
+        return self._project_metadata
+
+    def _execute(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Execute the GraphQL query."""
+        result = self._gitlab.http_post(
+            f"{self._gitlab.url}/api/graphql",
+            post_data={"query": query, "variables": variables},
+        )
+
+        if result.get("errors"):
+            raise gitlab.exceptions.GitlabError(result["errors"][0]["message"])
+
+        return result["data"]
+
+
+def _format_time(value: datetime | str | None) -> str | None:
+    """Format the time for GraphQL variables."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -1,6 +1,7 @@
 from .group import Group
 from .issue import Issue, IssueState, IssueType
 from .project import Project
+from .registry import Registry
 from .user import User
 
 __all__ = [
@@ -9,5 +10,6 @@ __all__ = [
     "IssueState",
     "IssueType",
     "Project",
+    "Registry",
     "User",
 ]
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass(kw_only=True, slots=True)
@@ -8,6 +9,17 @@ class Group:
     id: int
     name: str
 
+    @classmethod
+    def from_namespace(cls, namespace: dict[str, Any]) -> "Group | None":
+        """Create a Group instance from GitLab namespace if it is a group."""
+        if namespace["kind"] != "group":
+            return None
+
+        return cls(
+            id=namespace["id"],
+            name=namespace["name"],
+        )
+
     def __hash__(self) -> int:
         return self.id
 
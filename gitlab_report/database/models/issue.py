@@ -1,10 +1,12 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any
 
 import gitlab.base
 
 from .group import Group
 from .project import Project
+from .registry import Registry
 from .user import User
 
 
@@ -28,6 +30,7 @@ class IssueState(str, Enum):
 class Issue:
     """GitLab issue data."""
 
+    id: int
     type: IssueType
     state: IssueState
 
@@ -47,38 +50,71 @@ class Issue:
     def from_gitlab(
         cls,
         issue: gitlab.base.RESTObject,
-        project: gitlab.base.RESTObject,
+        project: Project,
+        group: Group | None,
+        registry: Registry | None = None,
     ) -> "Issue":
-        """Create an Issue instance from GitLab issue."""
+        """Create an Issue instance from GitLab issue.
+
+        Users and labels are taken from the registry if given, so they are
+        shared with other issues.
+        """
+        registry = registry or Registry()
         return cls(
+            id=issue.id,
             type=issue.issue_type,
             state=issue.state,
-            author=User(
-                id=issue.author["id"],
-                name=issue.author["name"],
-            ),
+            author=registry.user(issue.author["id"], issue.author["name"]),
             assignees=[
-                User(
-                    id=assignee["id"],
-                    name=assignee["name"],
-                )
+                registry.user(assignee["id"], assignee["name"])
                 for assignee in issue.assignees
             ],
-            labels=issue.labels,
-            group=(
-                Group(
-                    id=project.namespace["id"],
-                    name=project.namespace["name"],
-                )
-                if project.namespace["kind"] == "group"
-                else None
-            ),
-            project=Project(
-                id=project.id,
-                name=project.name,
-            ),
+            labels=registry.labels(issue.labels),
+            group=group,
+            project=project,
             created_at=issue.created_at,
             updated_at=issue.updated_at,
             closed_at=issue.closed_at,
             due_date=issue.due_date,
         )
+
+    @classmethod
+    def from_graphql(
+        cls,
+        issue: dict[str, Any],
+        project: Project,
+        group: Group | None,
+        registry: Registry | None = None,
+    ) -> "Issue":
+        """Create an Issue instance from GitLab GraphQL issue node.
+
+        Users and labels are taken from the registry if given, so they are
+        shared with other issues.
+        """
+        registry = registry or Registry()
+        return cls(
+            id=global_id(issue["id"]),
+            type=issue["type"].lower(),
+            state=issue["state"],
+            author=registry.user(
+                global_id(issue["author"]["id"]), issue["author"]["name"]
+            ),
+            assignees=[
+                registry.user(global_id(assignee["id"]), assignee["name"])
+                for assignee in issue["assignees"]["nodes"]
+            ],
+            labels=registry.labels(
+                label["title"] for label in issue["labels"]["nodes"]
+            ),
+            group=group,
+            project=project,
+            created_at=issue["createdAt"],
+            updated_at=issue["updatedAt"],
+            closed_at=issue["closedAt"],
+            due_date=issue["dueDate"],
+        )
+
+
+def global_id(gid: str) -> int:
+    """Get the numeric ID from GitLab global ID, e.g. `gid://gitlab/Issue/1`."""
+    return int(gid.rsplit("/", 1)[1])
@@ -0,0 +1,55 @@
+import sys
+from collections.abc import Iterable
+
+from .group import Group
+from .project import Project
+from .user import User
+
+
+class Registry:
+    """Registry of shared instances of GitLab entities.
+
+    Every entity ID maps to a single instance, which is shared by all issues
+    referencing the entity, and labels are interned strings. Names of entities
+    are taken from their first occurrence.
+    """
+
+    def __init__(self) -> None:
+        self._users: dict[int, User] = {}
+        self._groups: dict[int, Group] = {}
+        self._projects: dict[int, Project] = {}
+
+    def user(self, id: int, name: str) -> User:
+        """Get the user instance."""
+        user = self._users.get(id)
+        if user is None:
+            user = self._users.setdefault(id, User(id=id, name=name))
+        return user
+
+    def group(self, id: int, name: str) -> Group:
+        """Get the group instance."""
+        group = self._groups.get(id)
+        if group is None:
+            group = self._groups.setdefault(id, Group(id=id, name=name))
+        return group
+
+    def project(self, id: int, name: str) -> Project:
+        """Get the project instance."""
+        project = self._projects.get(id)
+        if project is None:
+            project = self._projects.setdefault(id, Project(id=id, name=name))
+        return project
+
+    def intern(
+        self, project: Project, group: Group | None
+    ) -> tuple[Project, Group | None]:
+        """Get the shared instances of the project and its group."""
+        return (
+            self.project(project.id, project.name),
+            self.group(group.id, group.name) if group else None,
+        )
+
+    @staticmethod
+    def labels(names: Iterable[str]) -> list[str]:
+        """Get the interned label names."""
+        return [sys.intern(name) for name in names]
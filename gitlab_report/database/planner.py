@@ -0,0 +1,182 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from itertools import product
+from math import prod
+from typing import Any
+
+from .collections.issues import Filter, FilterKeyword
+
+MAX_QUERIES_PER_FILTER = 10
+
+KEYWORDS = (FilterKeyword.Any, FilterKeyword.None_)
+
+
+@dataclass(frozen=True)
+class Query:
+    """Query for the GitLab issues API.
+
+    Issues are listed from the project or the group endpoint if either is set,
+    otherwise from the instance-wide endpoint.
+    """
+
+    project: int | None = None
+    group: int | None = None
+    params: frozenset[tuple[str, str | int]] = frozenset()
+
+    def covers(self, other: "Query") -> bool:
+        """Check whether all issues matching the other query match this one."""
+        if self.project is not None and self.project != other.project:
+            return False
+
+        if self.group is not None and self.group != other.group:
+            return False
+
+        return self.params <= other.params
+
+
+def plan_queries(filters: Iterable[Filter]) -> list[Query]:
+    """Plan the narrowest set of queries that covers issues of all filters.
+
+    Only the section filters need to be covered, since groups and columns
+    merely narrow down issues of their section. Criteria that cannot be pushed
+    down to the API are left for local filtering.
+    """
+    queries: list[Query] = []
+    for filter in filters:
+        queries.extend(_plan_filter(filter))
+
+    # Drop the queries covered by other ones, keeping the first of duplicates.
+    return [
+        query
+        for i, query in enumerate(queries)
+        if not any(
+            other.covers(query) and (not query.covers(other) or j < i)
+            for j, other in enumerate(queries)
+            if j != i
+        )
+    ]
+
+
+def _plan_filter(filter: Filter) -> list[Query]:
+    """Plan the queries that cover issues of the filter."""
+    dimensions = [
+        _params("issue_type", filter.type),
+        _params("state", filter.state),
+        _params("author_id", filter.author),
+        _params("assignee_id", filter.assignee),
+        _params("labels", filter.label),
+    ]
+
+    if filter.project:
+        dimensions.append(_scopes("project", filter.project))
+    elif filter.group and filter.group not in KEYWORDS:
+        # Group endpoint also lists issues of subgroups, which are later
+        # filtered out locally.
+        dimensions.append(_scopes("group", filter.group))
+
+    # Fall back to wider queries for the dimensions with the most alternatives.
+    while prod(len(dimension) for dimension in dimensions) > MAX_QUERIES_PER_FILTER:
+        widest = max(dimensions, key=len)
+        dimensions[dimensions.index(widest)] = [{}]
+
+    queries = []
+    for combination in product(*dimensions):
+        criteria = {key: value for part in combination for key, value in part.items()}
+        queries.append(
+            Query(
+                project=criteria.pop("project", None),
+                group=criteria.pop("group", None),
+                params=frozenset(criteria.items()),
+            )
+        )
+    return queries
+
+
+def _params(name: str, value: Any) -> list[dict[str, str | int]]:
+    """Get alternative API parameters for the filter value."""
+    if not value:
+        return [{}]
+
+    if isinstance(value, set):
+        return [{name: _format(item)} for item in sorted(value, key=str)]
+
+    return [{name: _format(value)}]
+
+
+def _scopes(name: str, value: int | set[int]) -> list[dict[str, str | int]]:
+    """Get alternative API endpoints for the filter value."""
+    if isinstance(value, set):
+        return [{name: item} for item in sorted(value)]
+
+    return [{name: value}]
+
+
+def _format(value: Any) -> str | int:
+    """Format the filter value for the API."""
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def exact_query(filters: Iterable[Filter]) -> Query | None:
+    """Build a query matching exactly the issues matching all the filters.
+
+    Returns `None` if the conjunction of the filters cannot be expressed by the
+    API, e.g. when a filter matches any of several values or issues are
+    filtered by group or overdue state.
+    """
+    params: dict[str, str | int] = {}
+    project = None
+
+    for filter in filters:
+        if filter.group or filter.overdue is not None:
+            return None
+
+        for name, value in (
+            ("issue_type", filter.type),
+            ("state", filter.state),
+            ("author_id", filter.author),
+            ("assignee_id", filter.assignee),
+        ):
+            value = _single(value)
+            if value is None:
+                return None
+            if value and params.setdefault(name, value) != value:
+                return None
+
+        label = _single(filter.label)
+        if label is None:
+            return None
+        if label:
+            labels = params.get("labels")
+            if labels and (labels in KEYWORDS or label in KEYWORDS):
+                return None
+            params["labels"] = f"{labels},{label}" if labels else label
+
+        value = _single(filter.project)
+        if value is None:
+            return None
+        if value:
+            if project is not None and project != value:
+                return None
+            project = value
+
+    return Query(project=project, params=frozenset(params.items()))
+
+
+def _single(value: Any) -> str | int | None:
+    """Get the single API value of the filter value.
+
+    Returns an empty string if the filter value is not set and `None` if it
+    matches several values.
+    """
+    if not value:
+        return ""
+
+    if isinstance(value, set):
+        if len(value) > 1:
+            return None
+        (value,) = value
+
+    return _format(value)
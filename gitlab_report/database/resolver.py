@@ -0,0 +1,77 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Self
+
+import gitlab
+
+from .. import profiling
+from .cache import ProjectCache
+from .models import Group, Project, Registry
+
+
+class ProjectResolver:
+    """Concurrent resolver for GitLab project metadata.
+
+    Projects are fetched in a bounded thread pool as soon as they are
+    requested, and every project is fetched at most once. Projects found in the
+    optional cache are not fetched at all. Projects and groups are taken from
+    the registry, so projects of the same group share its instance.
+    """
+
+    def __init__(
+        self,
+        client: gitlab.Gitlab,
+        *,
+        concurrency: int = 8,
+        cache: ProjectCache | None = None,
+        registry: Registry | None = None,
+    ) -> None:
+        self._gitlab = client
+        self._cache = cache
+        self._registry = registry or Registry()
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix="project-resolver",
+        )
+        self._futures: dict[int, Future[tuple[Project, Group | None]]] = {}
+        self._lock = Lock()
+
+    def submit(self, project_id: int) -> Future[tuple[Project, Group | None]]:
+        """Schedule fetching of the project unless it was already scheduled."""
+        with self._lock:
+            if project_id not in self._futures:
+                cached = self._cache.get(project_id) if self._cache else None
+                if cached:
+                    profiling.count("projects.cached")
+                    future = Future()
+                    future.set_result(self._registry.intern(*cached))
+                else:
+                    future = self._executor.submit(self._fetch, project_id)
+                self._futures[project_id] = future
+            return self._futures[project_id]
+
+    def get(self, project_id: int) -> tuple[Project, Group | None]:
+        """Get the project and its group, waiting for them to be fetched."""
+        return self.submit(project_id).result()
+
+    def _fetch(self, project_id: int) -> tuple[Project, Group | None]:
+        """Fetch the project and its group from GitLab."""
+        profiling.count("projects.fetched")
+        project = self._gitlab.projects.get(project_id)
+
+        if self._cache:
+            self._cache.put(project.id, project.name, project.namespace)
+
+        return self._registry.intern(
+            Project(id=project.id, name=project.name),
+            Group.from_namespace(project.namespace),
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
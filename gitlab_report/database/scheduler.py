@@ -0,0 +1,176 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import requests
+
+from .. import profiling
+
+
+class ScheduledSession(requests.Session):
+    """Session scheduling requests within the rate limits of GitLab.
+
+    The number of requests in flight is adjusted AIMD-style: it grows by one
+    per round of successful requests up to the given concurrency, and halves
+    whenever the server throttles a request or its remaining quota falls below
+    the reserve kept for other clients of the instance. Requests wait while
+    the quota is exhausted until it is reset.
+
+    Throttled requests are retried after the delay requested by the server or
+    an exponential backoff, with jitter so clients do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 8,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        reserve: float = 0.1,
+    ) -> None:
+        super().__init__()
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.reserve = reserve
+
+        self._limit = float(concurrency)
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._decreased_at = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Get the current limit of requests in flight."""
+        return int(self._limit)
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        # Redirects are followed outside the slot of the request, since each
+        # of them is sent as another request that needs a slot of its own.
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        response = self._send(request, **kwargs)
+        if not allow_redirects or not response.is_redirect:
+            return response
+
+        history = [response, *self.resolve_redirects(response, request, **kwargs)]
+        response = history.pop()
+        response.history = history
+        return response
+
+    def _send(
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        """Send the request without following redirects, retrying if throttled."""
+        attempt = 0
+        while True:
+            sent_at = self._acquire()
+            try:
+                response = super().send(request, allow_redirects=False, **kwargs)
+            finally:
+                with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+            delay = self._update(response, sent_at, attempt)
+            if delay is None or attempt >= self.max_retries:
+                return response
+
+            profiling.count("requests.retried")
+            response.close()
+            attempt += 1
+
+    def _acquire(self) -> float:
+        """Wait for a free slot and the end of any pause, returning the time."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    self._condition.wait(self._resume_at - now)
+                elif self._in_flight >= self.limit:
+                    self._condition.wait()
+                else:
+                    self._in_flight += 1
+                    return now
+
+    def _update(
+        self, response: requests.Response, sent_at: float, attempt: int
+    ) -> float | None:
+        """Adjust the schedule to the response.
+
+        Returns the delay before retrying the request if it was throttled.
+        """
+        now = time.monotonic()
+        headers = response.headers
+
+        with self._condition:
+            if response.status_code == 429:
+                profiling.count("requests.throttled")
+                retry_after = _seconds(headers.get("Retry-After"))
+                delay = (
+                    retry_after + random.uniform(0, self.backoff)
+                    if retry_after is not None
+                    else random.uniform(
+                        0, min(self.max_backoff, self.backoff * 2**attempt)
+                    )
+                )
+                self._decrease(sent_at)
+                self._pause(now + delay)
+                return delay
+
+            remaining = _int(headers.get("RateLimit-Remaining"))
+            quota = _int(headers.get("RateLimit-Limit")) or 0
+            if remaining is not None and remaining <= quota * self.reserve:
+                # Leave the rest of the quota to other clients until it is reset.
+                reset = _int(headers.get("RateLimit-Reset"))
+                if reset is not None:
+                    self._pause(now + max(0.0, reset - time.time()))
+                self._decrease(sent_at)
+            else:
+                # Additive increase of one request per round of requests.
+                self._limit = min(self.concurrency, self._limit + 1 / self._limit)
+
+            self._condition.notify_all()
+            return None
+
+    def _decrease(self, sent_at: float) -> None:
+        """Halve the limit, once for all requests sent before the last decrease."""
+        if sent_at >= self._decreased_at:
+            self._limit = max(1.0, self._limit / 2)
+            self._decreased_at = time.monotonic()
+
+    def _pause(self, until: float) -> None:
+        """Pause all requests until the time."""
+        self._resume_at = max(self._resume_at, until)
+        self._condition.notify_all()
+
+
+def _seconds(value: str | None) -> float | None:
+    """Parse `Retry-After` given either in seconds or as an HTTP date."""
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _int(value: str | None) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
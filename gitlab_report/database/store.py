@@ -0,0 +1,210 @@
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Self
+
+from .collections.table import timestamp
+from .models import Issue, Registry
+
+# Version of the schema of the store.
+SCHEMA_VERSION = 1
+
+
+class IssueStore:
+    """Local store of GitLab issues backed by SQLite.
+
+    The store mirrors all issues visible to the GitLab user and records the
+    time up to which it has been synced as a high-water mark, so subsequent
+    syncs only need to fetch issues updated after it. Issues deleted in GitLab
+    are not removed from the store.
+
+    Creation times are also stored as seconds since the epoch, so periods are
+    selected like in `Issues.period` whatever the format of the timestamps.
+    """
+
+    def __init__(self, path: Path, *, instance: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._instance = instance
+
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(f"""
+            PRAGMA user_version = {SCHEMA_VERSION};
+            CREATE TABLE IF NOT EXISTS issues (
+                instance TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                state TEXT NOT NULL,
+                author_id INTEGER NOT NULL,
+                author_name TEXT NOT NULL,
+                assignees TEXT NOT NULL,
+                labels TEXT NOT NULL,
+                group_id INTEGER,
+                group_name TEXT,
+                project_id INTEGER NOT NULL,
+                project_name TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                closed_at TEXT,
+                due_date TEXT,
+                created_time INTEGER NOT NULL,
+                PRIMARY KEY (instance, id)
+            );
+            CREATE INDEX IF NOT EXISTS issues_created_time
+                ON issues (instance, created_time);
+            CREATE TABLE IF NOT EXISTS sync (
+                instance TEXT PRIMARY KEY,
+                updated_at TEXT NOT NULL
+            );
+            """)
+
+    @property
+    def high_water_mark(self) -> str | None:
+        """Get the time up to which the store has been synced."""
+        row = self._connection.execute(
+            "SELECT updated_at FROM sync WHERE instance = ?",
+            (self._instance,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def upsert(
+        self,
+        issues: Iterable[Issue],
+        *,
+        mark: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """Insert or update the issues and advance the high-water mark to the mark.
+
+        The mark is the time the issues were fetched from, not their latest
+        `updated_at`, since issues are listed by creation and an issue updated
+        while they are fetched may be on a page listed before a later update.
+
+        All issues are written in a single transaction, so the high-water mark
+        is only advanced if every issue has been stored.
+        """
+        count = 0
+
+        with self._connection:
+            issues = iter(issues)
+            while batch := list(islice(issues, batch_size)):
+                self._connection.executemany(
+                    """
+                    INSERT OR REPLACE INTO issues
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [self._to_row(issue) for issue in batch],
+                )
+                count += len(batch)
+
+            if mark:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO sync VALUES (?, ?)",
+                    (self._instance, mark.isoformat()),
+                )
+
+        return count
+
+    def iter_issues(
+        self,
+        *,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        registry: Registry | None = None,
+    ) -> Iterator[Issue]:
+        """Iterate over the stored issues created in the period.
+
+        Users, groups, projects and labels are taken from the registry, so they
+        are shared by all issues.
+        """
+        registry = registry or Registry()
+        query = "SELECT * FROM issues WHERE instance = ?"
+        params: list[str | int] = [self._instance]
+
+        if created_after:
+            query += " AND created_time >= ?"
+            params.append(timestamp(created_after))
+
+        if created_before:
+            query += " AND created_time <= ?"
+            params.append(timestamp(created_before))
+
+        for row in self._connection.execute(
+            query + " ORDER BY created_time DESC, id DESC", params
+        ):
+            yield self._from_row(row, registry)
+
+    def _to_row(self, issue: Issue) -> tuple:
+        """Convert the issue to a table row."""
+        return (
+            self._instance,
+            issue.id,
+            issue.type,
+            issue.state,
+            issue.author.id,
+            issue.author.name,
+            json.dumps([[assignee.id, assignee.name] for assignee in issue.assignees]),
+            json.dumps(issue.labels),
+            issue.group.id if issue.group else None,
+            issue.group.name if issue.group else None,
+            issue.project.id,
+            issue.project.name,
+            issue.created_at,
+            issue.updated_at,
+            issue.closed_at,
+            issue.due_date,
+            timestamp(issue.created_at),
+        )
+
+    @staticmethod
+    def _from_row(row: tuple, registry: Registry) -> Issue:
+        """Convert the table row to an issue."""
+        (
+            _,
+            id,
+            type,
+            state,
+            author_id,
+            author_name,
+            assignees,
+            labels,
+            group_id,
+            group_name,
+            project_id,
+            project_name,
+            created_at,
+            updated_at,
+            closed_at,
+            due_date,
+            _,
+        ) = row
+
+        return Issue(
+            id=id,
+            type=type,
+            state=state,
+            author=registry.user(author_id, author_name),
+            assignees=[
+                registry.user(assignee_id, assignee_name)
+                for assignee_id, assignee_name in json.loads(assignees)
+            ],
+            labels=registry.labels(json.loads(labels)),
+            group=registry.group(group_id, group_name) if group_id else None,
+            project=registry.project(project_id, project_name),
+            created_at=created_at,
+            updated_at=updated_at,
+            closed_at=closed_at,
+            due_date=due_date,
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+
+from requests.adapters import HTTPAdapter
+
+from .scheduler import ScheduledSession
+
+
+@dataclass(frozen=True)
+class Transport:
+    """Configuration of the HTTP transport to the GitLab API.
+
+    Connections are pooled and kept alive, so requests of all the reports
+    sharing a session only go through TCP and TLS handshakes once per pooled
+    connection. The pool holds a connection per concurrent request unless its
+    size is given. Responses are compressed, which shrinks pages of issues
+    several times over.
+    """
+
+    pool_size: int | None = None
+    keep_alive: bool = True
+    compression: bool = True
+
+
+def open_session(
+    transport: Transport | None = None, *, concurrency: int = 8
+) -> ScheduledSession:
+    """Open a session to the GitLab API, to be shared by databases."""
+    transport = transport or Transport()
+    session = ScheduledSession(concurrency=concurrency)
+
+    pool_size = transport.pool_size or concurrency
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, HTTPAdapter(pool_maxsize=pool_size))
+
+    # Keep-alive and compression are defaults of requests, which accepts every
+    # encoding its installed decoders support.
+    if not transport.keep_alive:
+        session.headers["Connection"] = "close"
+    if not transport.compression:
+        session.headers["Accept-Encoding"] = "identity"
+
+    return session
@@ -1,6 +1,19 @@
+import importlib
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from pathlib import Path
+from types import ModuleType
 
-__all__ = ["Format"]
+from .. import profiling
+from ..report import Report
+from .rendering import Rendering
+
+__all__ = ["Format", "export_all"]
+
+# Representations derived from other ones, e.g. HTML is converted from Markdown.
+_SOURCES = {"html": "markdown"}
 
 
 class Format(str, Enum):
@@ -11,3 +24,53 @@ class Format(str, Enum):
     HTML = "html"
     Markdown = "markdown"
     JSON = "json"
+    NDJSON = "ndjson"
+
+
+def export_all(
+    report: Report,
+    formats: list[Format],
+    *,
+    output_dir: Path,
+    prefix: str,
+) -> None:
+    """Export the report to the output directory in all the formats.
+
+    Exporters run concurrently and share the intermediate representations of
+    the report, e.g. HTML content is generated once for both HTML and PDF
+    formats, while slow exporters like PDF do not hold up the other ones.
+    Representations used by a single exporter, as declared by the
+    `REPRESENTATION` of its module, are streamed to its file instead.
+    Representations are also used by the exporters of the ones derived from
+    them, e.g. Markdown content is shared by the Markdown and HTML formats.
+    """
+    exporters = [
+        importlib.import_module(f"{__name__}.{format.name.lower()}")
+        for format in dict.fromkeys(formats)
+    ]
+    representations = Counter(
+        name for exporter in exporters for name in _derivation(exporter.REPRESENTATION)
+    )
+    rendering = Rendering(
+        report,
+        shared=[name for name, count in representations.items() if count > 1],
+    )
+
+    def export(exporter: ModuleType) -> None:
+        with profiling.span(f"export.{exporter.__name__.rsplit('.', 1)[1]}"):
+            exporter.export(
+                report, output_dir=output_dir, prefix=prefix, rendering=rendering
+            )
+
+    with ThreadPoolExecutor(thread_name_prefix="exporter") as executor:
+        futures = [executor.submit(export, exporter) for exporter in exporters]
+        for future in futures:
+            future.result()
+
+
+def _derivation(name: str) -> Iterator[str]:
+    """Iterate over the representation and the ones it is derived from."""
+    source: str | None = name
+    while source:
+        yield source
+        source = _SOURCES.get(source)
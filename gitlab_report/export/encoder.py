@@ -0,0 +1,19 @@
+"""JSON encoding using `orjson` if it is installed."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any, *, indent: bool = False) -> str:
+    """Encode the value as JSON, indented by two spaces or compact."""
+    if orjson:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+    if indent:
+        return json.dumps(value, indent=2)
+    return json.dumps(value, separators=(",", ":"))
@@ -1,9 +1,13 @@
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import mistune
 
 from ..report import Report
-from .markdown import generate_markdown
+from .markdown import iter_parts, render_markdown
+from .rendering import Rendering
+
+REPRESENTATION = "html"
 
 
 class HTMLRenderer(mistune.HTMLRenderer): ...
@@ -14,22 +18,51 @@ def export(
     *,
     output_dir: Path,
     prefix: str,
+    rendering: Rendering | None = None,
 ) -> None:
     """Export the report to the output directory in HTML format."""
+    rendering = rendering or Rendering(report)
     with open(output_dir / f"{prefix}.html", "w") as file:
-        content = generate_html(report)
-        file.write(content)
+        file.writelines(render_html(rendering))
+
+
+def render_html(rendering: Rendering) -> Iterable[str]:
+    """Get the HTML content of the rendered report in chunks.
+
+    HTML is converted from the Markdown content if it is shared with the
+    Markdown exporter, otherwise from Markdown generated part by part.
+    """
+    markdown = render_markdown(rendering) if rendering.shared("markdown") else None
+    return rendering.stream(
+        "html", lambda: iter_html(rendering.report, markdown=markdown)
+    )
 
 
 def generate_html(report: Report) -> str:
     """Generate the HTML content from the report."""
-    markdown = generate_markdown(report)
-    body = str(mistune.html(markdown))
-    return f"""
+    return "".join(iter_html(report))
+
+
+def iter_html(
+    report: Report, *, markdown: Iterable[str] | None = None
+) -> Iterator[str]:
+    """Generate the HTML content from the report chunk by chunk.
+
+    Markdown content, given as the parts generated by `iter_parts` unless
+    already generated, is converted to HTML part by part, so the whole
+    Markdown content is never held in memory.
+    """
+    yield _HEAD.format(title=report.title)
+    for part in iter_parts(report) if markdown is None else markdown:
+        yield str(mistune.html(part))
+    yield _TAIL
+
+
+_HEAD = """
 <!DOCTYPE html>
 <html>
 <head>
-    <title>{report.title}</title>
+    <title>{title}</title>
     <style>
         body {{
             font-family: Arial, sans-serif;
@@ -61,7 +94,9 @@ def generate_html(report: Report) -> str:
     </style>
 </head>
 <body>
-    {body}
+    """
+
+_TAIL = """
 </body>
 </html>
 """
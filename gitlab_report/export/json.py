@@ -1,7 +1,13 @@
-import json
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 
+from ..blocks.section import Section
 from ..report import Report
+from . import encoder
+from .rendering import Rendering
+
+REPRESENTATION = "json"
 
 
 def export(
@@ -9,9 +15,34 @@ def export(
     *,
     output_dir: Path,
     prefix: str,
+    rendering: Rendering | None = None,
 ) -> None:
     """Export the report to the output directory in JSON format."""
-    dump = {
+    rendering = rendering or Rendering(report)
+    with open(output_dir / f"{prefix}.json", "w", encoding="utf-8") as file:
+        file.writelines(rendering.stream("json", lambda: iter_json(rendering.report)))
+
+
+def iter_json(report: Report) -> Iterator[str]:
+    """Generate the JSON content from the report section by section.
+
+    Content is the same as of the whole report encoded at once, indented by
+    two spaces.
+    """
+    heading = encoder.dumps(report_tree(report), indent=True)
+    # Reopen the encoded object to append the sections to it.
+    yield heading.removesuffix("\n}") + ',\n  "sections": ['
+
+    for i, section in enumerate(report.sections):
+        content = encoder.dumps(section_tree(section), indent=True)
+        yield ("," if i else "") + "\n    " + content.replace("\n", "\n    ")
+
+    yield "\n  ]\n}" if report.sections else "]\n}"
+
+
+def report_tree(report: Report) -> dict[str, Any]:
+    """Generate the JSON tree of the report without its sections."""
+    return {
         "title": report.title,
         "image": report.image,
         "period_from": (
@@ -20,28 +51,26 @@ def export(
         "period_to": (
             report.period_to.strftime("%Y-%m-%d") if report.period_to else None
         ),
-        "sections": [
+    }
+
+
+def section_tree(section: Section) -> dict[str, Any]:
+    """Generate the JSON tree of the section."""
+    return {
+        "title": section.title,
+        "total": section.total,
+        "groups": [
             {
-                "title": section.title,
-                "total": section.total,
-                "groups": [
+                "title": group.title,
+                "total": group.total,
+                "columns": [
                     {
-                        "title": group.title,
-                        "total": group.total,
-                        "columns": [
-                            {
-                                "title": column.title,
-                                "total": column.total,
-                            }
-                            for column in group.columns
-                        ],
+                        "title": column.title,
+                        "total": column.total,
                     }
-                    for group in section.groups
+                    for column in group.columns
                 ],
             }
-            for section in report.sections
+            for group in section.groups
         ],
     }
-
-    with open(output_dir / f"{prefix}.json", "w") as file:
-        json.dump(dump, file, indent=2)
@@ -1,7 +1,12 @@
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
 
+from ..blocks.section import Section
 from ..report import Report
+from .rendering import Rendering
+
+REPRESENTATION = "markdown"
 
 
 def export(
@@ -9,16 +14,47 @@ def export(
     *,
     output_dir: Path,
     prefix: str,
+    rendering: Rendering | None = None,
 ) -> None:
     """Export the report to the output directory in Markdown format."""
+    rendering = rendering or Rendering(report)
     with open(output_dir / f"{prefix}.md", "w") as file:
-        content = generate_markdown(report)
-        file.write(content)
+        file.writelines(render_markdown(rendering))
+
+
+def render_markdown(rendering: Rendering) -> Iterable[str]:
+    """Get the Markdown content of the rendered report in chunks.
+
+    Shared content is kept as a chunk per part, i.e. the heading and each
+    section, so HTML is converted from it part by part.
+    """
+    if not rendering.shared("markdown"):
+        return iter_markdown(rendering.report)
+    return rendering.get("markdown", lambda: list(iter_parts(rendering.report)))
 
 
 def generate_markdown(report: Report) -> str:
     """Generate the Markdown content from the report."""
-    content = f"# {report.title}\n\n"
+    return "".join(iter_markdown(report))
+
+
+def iter_markdown(report: Report) -> Iterator[str]:
+    """Generate the Markdown content from the report chunk by chunk."""
+    yield from iter_heading(report)
+    for section in report.sections:
+        yield from iter_section(section)
+
+
+def iter_parts(report: Report) -> Iterator[str]:
+    """Generate the Markdown content of the heading and then of each section."""
+    yield "".join(iter_heading(report))
+    for section in report.sections:
+        yield "".join(iter_section(section))
+
+
+def iter_heading(report: Report) -> Iterator[str]:
+    """Generate the Markdown content of the report heading."""
+    yield f"# {report.title}\n\n"
 
     if report.period_from or report.period_to:
         period = "Period "
@@ -31,48 +67,44 @@ def generate_markdown(report: Report) -> str:
             else datetime.now().strftime("to %Y-%m-%d (Today)")
         )
 
-        content += f"{period}\n"
+        yield f"{period}\n"
 
-    for section in report.sections:
-        content += f"\n## {section.title}\n\n"
-
-        max_group_title_length = max(len(group.title) for group in section.groups)
 
-        header = "|"
-        separator = "|:"
+def iter_section(section: Section) -> Iterator[str]:
+    """Generate the Markdown content of the section row by row."""
+    yield f"\n## {section.title}\n\n"
 
-        header += " " * max_group_title_length
-        separator += "-" * (max_group_title_length - 1)
+    max_group_title_length = max(len(group.title) for group in section.groups)
 
-        total_column = "Number of Issues"
+    header = "|"
+    separator = "|:"
 
-        header += f"|{total_column}|"
-        separator += f"|:{'-' * (len(total_column) - 1)}|"
-
-        header += "".join(f"{column.title}|" for column in section.groups[0].columns)
-        separator += "".join(
-            f":{'-' * (len(column.title) - 1)}|" for column in section.groups[0].columns
-        )
+    header += " " * max_group_title_length
+    separator += "-" * (max_group_title_length - 1)
 
-        header += "\n"
-        separator += "\n"
+    total_column = "Number of Issues"
 
-        content += header + separator
+    header += f"|{total_column}|"
+    separator += f"|:{'-' * (len(total_column) - 1)}|"
 
-        for group in section.groups:
-            row = "|"
+    header += "".join(f"{column.title}|" for column in section.groups[0].columns)
+    separator += "".join(
+        f":{'-' * (len(column.title) - 1)}|" for column in section.groups[0].columns
+    )
 
-            row += group.title.ljust(max_group_title_length) + "|"
+    yield header + "\n"
+    yield separator + "\n"
 
-            percent = int(group.total / section.total * 100) if section.total else 0
-            row += f"{group.total} ({percent}%)".rjust(len(total_column)) + "|"
+    for group in section.groups:
+        row = ["|", group.title.ljust(max_group_title_length), "|"]
 
-            for column in group.columns:
-                percent = int(column.total / group.total * 100) if group.total else 0
-                row += f"{column.total} ({percent}%)".rjust(len(column.title)) + "|"
+        percent = int(group.total / section.total * 100) if section.total else 0
+        row += [f"{group.total} ({percent}%)".rjust(len(total_column)), "|"]
 
-            row += "\n"
+        for column in group.columns:
+            percent = int(column.total / group.total * 100) if group.total else 0
+            row += [f"{column.total} ({percent}%)".rjust(len(column.title)), "|"]
 
-            content += row
+        row.append("\n")
 
-    return content
+        yield "".join(row)
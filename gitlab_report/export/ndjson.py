@@ -0,0 +1,64 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+from ..report import Report
+from . import encoder
+from .json import report_tree
+from .rendering import Rendering
+
+REPRESENTATION = "ndjson"
+
+
+def export(
+    report: Report,
+    *,
+    output_dir: Path,
+    prefix: str,
+    rendering: Rendering | None = None,
+) -> None:
+    """Export the report to the output directory in NDJSON format."""
+    rendering = rendering or Rendering(report)
+    with open(output_dir / f"{prefix}.ndjson", "w", encoding="utf-8") as file:
+        file.writelines(
+            rendering.stream("ndjson", lambda: iter_ndjson(rendering.report))
+        )
+
+
+def iter_ndjson(report: Report) -> Iterator[str]:
+    """Generate the NDJSON content from the report line by line.
+
+    The first line describes the report, followed by a line for each section,
+    each of its groups and each cell of a group and a column. Lines of groups
+    and cells refer to their section, group and column by title.
+    """
+    yield _line({"type": "report", **report_tree(report)})
+
+    for section in report.sections:
+        yield _line(
+            {"type": "section", "section": section.title, "total": section.total}
+        )
+
+        for group in section.groups:
+            yield _line(
+                {
+                    "type": "group",
+                    "section": section.title,
+                    "group": group.title,
+                    "total": group.total,
+                }
+            )
+
+            for column in group.columns:
+                yield _line(
+                    {
+                        "type": "cell",
+                        "section": section.title,
+                        "group": group.title,
+                        "column": column.title,
+                        "total": column.total,
+                    }
+                )
+
+
+def _line(record: dict) -> str:
+    return encoder.dumps(record) + "\n"
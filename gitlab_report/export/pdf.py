@@ -3,7 +3,10 @@ from pathlib import Path
 import pdfkit
 
 from ..report import Report
-from .html import generate_html
+from .html import render_html
+from .rendering import Rendering
+
+REPRESENTATION = "html"
 
 
 def export(
@@ -11,7 +14,8 @@ def export(
     *,
     output_dir: Path,
     prefix: str,
+    rendering: Rendering | None = None,
 ) -> None:
     """Export the report to the output directory in PDF format."""
-    html = generate_html(report)
+    html = "".join(render_html(rendering or Rendering(report)))
     pdfkit.from_string(html, output_dir / f"{prefix}.pdf")
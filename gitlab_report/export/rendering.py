@@ -0,0 +1,48 @@
+from collections.abc import Callable, Iterable, Iterator
+from threading import Lock
+from typing import Any, TypeVar
+
+from ..report import Report
+
+T = TypeVar("T")
+
+
+class Rendering:
+    """Intermediate representations of a report shared by its exporters.
+
+    Every representation, e.g. the JSON tree, is built at most once, even if
+    exporters running concurrently request it at the same time. Streamed
+    representations, e.g. the HTML content, are only kept in memory if they
+    are shared by several exporters.
+    """
+
+    def __init__(self, report: Report, *, shared: Iterable[str] = ()) -> None:
+        self.report = report
+        self._shared = frozenset(shared)
+        self._representations: dict[str, Any] = {}
+        self._locks: dict[str, Lock] = {}
+        self._lock = Lock()
+
+    def shared(self, name: str) -> bool:
+        """Check whether the representation is shared by several exporters."""
+        return name in self._shared
+
+    def get(self, name: str, build: Callable[[], T]) -> T:
+        """Get the representation, building it on the first call."""
+        with self._lock:
+            lock = self._locks.setdefault(name, Lock())
+
+        with lock:
+            if name not in self._representations:
+                self._representations[name] = build()
+            return self._representations[name]
+
+    def stream(self, name: str, generate: Callable[[], Iterator[str]]) -> Iterable[str]:
+        """Get the chunks of the streamed representation.
+
+        Chunks are generated lazily unless the representation is shared, in
+        which case they are generated once and kept.
+        """
+        if name not in self._shared:
+            return generate()
+        return self.get(name, lambda: list(generate()))
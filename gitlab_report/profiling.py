@@ -0,0 +1,257 @@
+"""Profiling of report creation.
+
+Phases of report creation are recorded as spans with their wall time and the
+numbers of issues they handled, and requests to the GitLab API are recorded
+by a response hook of the session with their endpoint, status and bytes.
+Profiling is off unless a profiler is active, in which case spans of all
+threads are recorded by it.
+"""
+
+import io
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+
+
+class Profiler:
+    """Recorder of spans and counters.
+
+    The results are summarised by span name and API endpoint, and can be
+    exported as Chrome trace events, viewable in Perfetto or `chrome://tracing`.
+    """
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self._spans: list[dict[str, Any]] = []
+        self._counters: Counter[str] = Counter()
+        self._threads: dict[int, str] = {}
+        self._sessions: list[requests.Session] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[dict[str, Any]]:
+        """Record the wall time of the block.
+
+        The arguments of the span are yielded, so the block can add its results.
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self._record(name, category, start, time.perf_counter(), args)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment the counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def instrument(self, session: requests.Session) -> None:
+        """Record the requests of the session."""
+        if self._record_response not in session.hooks["response"]:
+            session.hooks["response"].append(self._record_response)
+            with self._lock:
+                self._sessions.append(session)
+
+    def close(self) -> None:
+        """Stop recording the requests of the instrumented sessions."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.hooks["response"].remove(self._record_response)
+
+    def summary(self) -> dict[str, Any]:
+        """Summarise the spans by name and the requests by endpoint."""
+        phases: dict[str, dict[str, Any]] = {}
+        endpoints: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self._spans)
+            counters = dict(self._counters)
+
+        for span in spans:
+            if span["category"] == "request":
+                stats = endpoints.setdefault(
+                    span["name"],
+                    {"count": 0, "time": 0.0, "bytes_sent": 0, "bytes_received": 0},
+                )
+                stats["count"] += 1
+                stats["time"] += span["duration"]
+                stats["bytes_sent"] += span["args"]["bytes_sent"]
+                stats["bytes_received"] += span["args"]["bytes_received"]
+                continue
+
+            stats = phases.setdefault(span["name"], {"count": 0, "time": 0.0})
+            stats["count"] += 1
+            stats["time"] += span["duration"]
+            if "issues" in span["args"]:
+                stats["issues"] = stats.get("issues", 0) + span["args"]["issues"]
+
+        return {
+            "phases": phases,
+            "requests": endpoints,
+            "counters": counters,
+        }
+
+    def trace(self) -> dict[str, Any]:
+        """Export the spans as Chrome trace events."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            threads = dict(self._threads)
+
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        events.extend(
+            {
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": (span["start"] - self._start) * 1e6,
+                "dur": span["duration"] * 1e6,
+                "pid": pid,
+                "tid": span["thread"],
+                "args": span["args"],
+            }
+            for span in spans
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        """Write the summary to the file and the trace events next to it."""
+        path.write_text(json.dumps(self.summary(), indent=2, default=str))
+        path.with_suffix(".trace.json").write_text(
+            json.dumps(self.trace(), default=str)
+        )
+
+    def _record(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: dict[str, Any],
+    ) -> None:
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._spans.append(
+                {
+                    "name": name,
+                    "category": category,
+                    "start": start,
+                    "duration": end - start,
+                    "thread": thread.ident,
+                    "args": args,
+                }
+            )
+
+    def _record_response(
+        self,
+        response: requests.Response,
+        *args: Any,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Record the request of the response, ending when it was received."""
+        end = time.perf_counter()
+        path = urlparse(response.url).path.removeprefix("/api/v4")
+        body = response.request.body or b""
+        self._record(
+            re.sub(r"/\d+(?=/|$)", "/:id", path),
+            "request",
+            end - response.elapsed.total_seconds(),
+            end,
+            {
+                "method": response.request.method,
+                "status": response.status_code,
+                "bytes_sent": len(body),
+                "bytes_received": _received(response, stream),
+            },
+        )
+
+
+def _received(response: requests.Response, stream: bool = False) -> int:
+    """Get the size of the response body as received, before decompression."""
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length)
+
+    raw = response.raw
+    if stream or not isinstance(raw, urllib3.HTTPResponse):
+        return 0
+
+    # Responses without a length, e.g. chunked ones, are read as received and
+    # decompressed from memory.
+    body = b"".join(raw.stream(decode_content=False))
+    raw.release_conn()
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body),
+        headers=raw.headers,
+        status=raw.status,
+        preload_content=False,
+        decode_content=raw.decode_content,
+    )
+    return len(body)
+
+
+_profiler: Profiler | None = None
+
+
+@contextmanager
+def profile() -> Iterator[Profiler]:
+    """Profile report creation within the block."""
+    global _profiler
+    profiler = Profiler()
+    previous, _profiler = _profiler, profiler
+    try:
+        with profiler.span("total", "phase"):
+            yield profiler
+    finally:
+        profiler.close()
+        _profiler = previous
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[dict[str, Any]]:
+    """Record the wall time of the block if profiling.
+
+    The arguments of the span are yielded, so the block can add its results,
+    e.g. the number of `issues` it handled.
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield args
+        return
+
+    with profiler.span(name, "phase", **args) as args:
+        yield args
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increment the counter if profiling."""
+    if _profiler is not None:
+        _profiler.count(name, value)
+
+
+def instrument(session: requests.Session) -> None:
+    """Record the requests of the session if profiling."""
+    if _profiler is not None:
+        _profiler.instrument(session)
@@ -2,10 +2,22 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+import requests
 from pydantic import BaseModel, Field
 
+from . import profiling
 from .blocks.section import Section, SectionConfig
-from .database import Database
+from .database import (
+    Backend,
+    Database,
+    GraphQLDatabase,
+    Issues,
+    IssueStore,
+    ProjectCache,
+)
+from .database.collections.table import timestamp
+from .database.counter import IssueCounter
+from .database.planner import plan_queries
 
 
 class ReportConfig(BaseModel):
@@ -41,23 +53,134 @@ def create_report(
     oauth_token: str | None = None,
     skip_ssl: bool = False,
     ca_file: Path | None = None,
+    concurrency: int = 8,
+    project_cache: ProjectCache | None = None,
+    issue_store: IssueStore | None = None,
+    count_only: bool = False,
+    backend: Backend = Backend.REST,
+    aggregate: bool = True,
+    session: requests.Session | None = None,
 ) -> Report:
-    """Create a GitLab report."""
-    with Database(
+    """Create a GitLab report.
+
+    In count-only mode issues are counted using the totals reported by the API
+    wherever the filters can be expressed as API queries.
+
+    In aggregation mode the sections only keep the aggregates needed by the
+    exporters, and the fetched issues are released once the report is created.
+
+    Reports created in the same process can share a session opened by
+    `open_session`, so they reuse its connections to GitLab.
+    """
+    options = {
+        "url": url,
+        "access_token": access_token,
+        "oauth_token": oauth_token,
+        "skip_ssl": skip_ssl,
+        "ca_file": ca_file,
+        "concurrency": concurrency,
+        "project_cache": project_cache,
+        "issue_store": issue_store,
+        "backend": backend,
+        "session": session,
+    }
+
+    if not count_only:
+        issues = fetch_issues([config], **options)
+        return build_report(config, issues, aggregate=aggregate)
+
+    sections = [Section(section_config) for section_config in config.sections]
+    with _open_database(**options) as db:
+        counter = IssueCounter(
+            db,
+            queries=plan_queries(config.sections),
+            created_after=config.period_from,
+            created_before=config.period_to,
+        )
+        with profiling.span("count"):
+            for section in sections:
+                section.count(counter)
+
+    return Report(
+        title=config.title,
+        image=config.image,
+        period_from=config.period_from,
+        period_to=config.period_to,
+        sections=sections,
+    )
+
+
+def fetch_issues(
+    configs: list[ReportConfig],
+    *,
+    url: str,
+    access_token: str | None = None,
+    oauth_token: str | None = None,
+    skip_ssl: bool = False,
+    ca_file: Path | None = None,
+    concurrency: int = 8,
+    project_cache: ProjectCache | None = None,
+    issue_store: IssueStore | None = None,
+    backend: Backend = Backend.REST,
+    session: requests.Session | None = None,
+) -> Issues:
+    """Fetch the issues needed by all the reports in a single session.
+
+    Issues are fetched for the union of the periods of the reports, so each
+    report has to be built from the issues of its own period.
+    """
+    queries = plan_queries(
+        section_config for config in configs for section_config in config.sections
+    )
+
+    # Periods are compared in UTC, whether or not their time zone is given.
+    periods_from = [config.period_from for config in configs]
+    periods_to = [config.period_to for config in configs]
+    created_after = None if None in periods_from else min(periods_from, key=timestamp)
+    created_before = None if None in periods_to else max(periods_to, key=timestamp)
+
+    with _open_database(
         url=url,
         access_token=access_token,
         oauth_token=oauth_token,
         skip_ssl=skip_ssl,
         ca_file=ca_file,
+        concurrency=concurrency,
+        project_cache=project_cache,
+        issue_store=issue_store,
+        backend=backend,
+        session=session,
     ) as db:
-        issues = db.get_issues(
-            created_after=config.period_from,
-            created_before=config.period_to,
-        )
+        with profiling.span("fetch", queries=len(queries)) as span:
+            issues = db.get_issues(
+                queries=queries,
+                created_after=created_after,
+                created_before=created_before,
+            )
+            span["issues"] = issues.total()
+        return issues
 
-    sections = [Section(section_config) for section_config in config.sections]
-    for section in sections:
-        section.load(issues)
+
+def build_report(
+    config: ReportConfig,
+    issues: Issues,
+    *,
+    aggregate: bool = True,
+) -> Report:
+    """Build a GitLab report from the fetched issues.
+
+    Issues may have been fetched for a wider period, e.g. shared by several
+    reports, and are narrowed down to the period of the report. Reports can be
+    built concurrently from the same issues.
+    """
+    with profiling.span("build", title=config.title) as span:
+        if config.period_from or config.period_to:
+            issues = issues.period(config.period_from, config.period_to)
+        span["issues"] = issues.total()
+
+        sections = [Section(section_config) for section_config in config.sections]
+        for section in sections:
+            section.load(issues, aggregate=aggregate)
 
     return Report(
         title=config.title,
@@ -66,3 +189,15 @@ def create_report(
         period_to=config.period_to,
         sections=sections,
     )
+
+
+def _open_database(
+    *,
+    project_cache: ProjectCache | None,
+    issue_store: IssueStore | None,
+    backend: Backend,
+    **kwargs,
+) -> Database:
+    """Open the database for the backend."""
+    database = GraphQLDatabase if backend == Backend.GraphQL else Database
+    return database(cache=project_cache, store=issue_store, **kwargs)
@@ -0,0 +1,57 @@
+from collections.abc import Iterator
+
+import pytest
+
+from benchmarks.data import generate_issues
+from benchmarks.server import MockGitLab
+from gitlab_report.database.models import Issue
+
+
+@pytest.fixture(scope="session")
+def issues() -> list[Issue]:
+    return generate_issues(500, seed=1)
+
+
+@pytest.fixture
+def server(issues: list[Issue]) -> Iterator[MockGitLab]:
+    with MockGitLab(issues) as server:
+        yield server
+
+
+def summarize(issue: Issue) -> tuple:
+    """Get the fields of the issue used by reports."""
+    return (
+        issue.id,
+        issue.type,
+        issue.state,
+        issue.author.id,
+        tuple(sorted(assignee.id for assignee in issue.assignees)),
+        tuple(issue.labels),
+        issue.project.id,
+        issue.group.id if issue.group else None,
+        issue.created_at,
+        issue.updated_at,
+        issue.closed_at,
+        issue.due_date,
+    )
+
+
+def assert_shared(issues: list[Issue]) -> None:
+    """Check that issues reference a single instance per user, group and project.
+
+    Labels are checked to be the same string objects as well.
+    """
+    instances: dict[tuple[str, object], set[int]] = {}
+    for issue in issues:
+        for kind, value in [
+            ("user", issue.author),
+            *(("user", assignee) for assignee in issue.assignees),
+            ("group", issue.group),
+            ("project", issue.project),
+            *(("label", label) for label in issue.labels),
+        ]:
+            if value is not None:
+                key = getattr(value, "id", value)
+                instances.setdefault((kind, key), set()).add(id(value))
+
+    assert all(len(ids) == 1 for ids in instances.values())
@@ -0,0 +1,58 @@
+import json
+from datetime import timedelta
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from benchmarks.server import MockGitLab
+from gitlab_report.cli import app
+from gitlab_report.database import Database, ProjectCache
+from gitlab_report.database.models import Issue
+
+
+def _fetch(server: MockGitLab, path: Path, **kwargs) -> int:
+    """Fetch the issues with the cache, counting the projects fetched."""
+    server.counts.clear()
+    with ProjectCache(path, instance=server.url, **kwargs) as cache:
+        with Database(url=server.url, access_token="token", cache=cache) as db:
+            db.get_issues()
+    return server.counts["/projects/:id"]
+
+
+def test_project_cache(server: MockGitLab, issues: list[Issue], tmp_path: Path) -> None:
+    path = tmp_path / "projects.sqlite"
+    projects = len({issue.project.id for issue in issues})
+
+    # Projects are looked up in the cache before they are fetched.
+    assert _fetch(server, path) == projects
+    assert _fetch(server, path) == 0
+
+    # Refreshed projects are fetched again and cached for the next runs.
+    assert _fetch(server, path, refresh=True) == projects
+    assert _fetch(server, path) == 0
+
+    # Only the latest projects are kept when the cache is opened.
+    assert _fetch(server, path, max_size=3) == projects - 3
+    assert _fetch(server, path) == 0
+
+    # Expired projects are fetched again.
+    assert _fetch(server, path, ttl=timedelta(0)) == projects
+
+
+def test_refresh_metadata(
+    server: MockGitLab, issues: list[Issue], tmp_path: Path
+) -> None:
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"title": "Report"}))
+    options = [
+        str(config_file),
+        *("-u", server.url, "--access-token", "token"),
+        *("-o", str(tmp_path), "--cache-dir", str(tmp_path)),
+    ]
+    projects = len({issue.project.id for issue in issues})
+
+    for extra, fetched in [([], projects), ([], 0), (["--refresh-metadata"], projects)]:
+        server.counts.clear()
+        result = CliRunner().invoke(app, [*options, *extra])
+        assert result.exit_code == 0, result.output
+        assert server.counts["/projects/:id"] == fetched
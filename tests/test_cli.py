@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from benchmarks.server import MockGitLab
+from gitlab_report import __version__
+from gitlab_report.cli import app
+
+CONFIG = {"title": "Report", "sections": [{"title": "Open", "state": "opened"}]}
+
+
+def _options(server: MockGitLab, output_dir: Path) -> list[str]:
+    return ["-u", server.url, "--access-token", "token", "-o", str(output_dir)]
+
+
+def test_report_without_command(server: MockGitLab, tmp_path: Path) -> None:
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+
+    result = CliRunner().invoke(
+        app, [str(config_file), *_options(server, tmp_path), "-p", "report"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads((tmp_path / "report.json").read_text())["title"] == "Report"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["-v"], ["--version"], ["report", "--version"], ["config.json", "-v"]],
+)
+def test_version(tmp_path: Path, args: list[str]) -> None:
+    (tmp_path / "config.json").write_text(json.dumps(CONFIG))
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(tmp_path)
+        result = CliRunner().invoke(app, args)
+
+    assert result.exit_code == 0, result.output
+    assert result.output.strip() == __version__
+
+
+def test_batch(server: MockGitLab, tmp_path: Path) -> None:
+    configs = tmp_path / "configs"
+    configs.mkdir()
+    for name in ("first", "second"):
+        (configs / f"{name}.json").write_text(json.dumps(CONFIG | {"title": name}))
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "batch",
+            str(configs),
+            str(configs / "first.json"),
+            *_options(server, tmp_path),
+            "-p",
+            "batch",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == [
+        "batch-first.json",
+        "batch-second.json",
+    ]
+    assert json.loads((tmp_path / "batch-second.json").read_text())["title"] == "second"
+
+
+def test_batch_same_names(server: MockGitLab, tmp_path: Path) -> None:
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "config.json").write_text(json.dumps(CONFIG))
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "batch",
+            str(tmp_path / "a"),
+            str(tmp_path / "b"),
+            *_options(server, tmp_path),
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_report_profile(server: MockGitLab, tmp_path: Path) -> None:
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    profile = tmp_path / "profile.out"
+
+    result = CliRunner().invoke(
+        app,
+        [str(config_file), *_options(server, tmp_path), "--profile", str(profile)],
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = json.loads(profile.read_text())
+    assert {"total", "auth", "fetch", "build", "export.json"} <= summary[
+        "phases"
+    ].keys()
+    assert summary["phases"]["fetch"]["issues"] > 0
+    assert summary["requests"]["/issues"]["count"] == server.counts["/issues"]
+    assert json.loads(profile.with_suffix(".trace.json").read_text())["traceEvents"]
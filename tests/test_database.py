@@ -0,0 +1,219 @@
+import dataclasses
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+
+from benchmarks.server import MockGitLab
+from gitlab_report.blocks.section import SectionConfig
+from gitlab_report.database import Database, Issues, IssueStore, open_session
+from gitlab_report.database.collections.issues import GroupBy
+from gitlab_report.database.database import SYNC_CLOCK_SKEW
+from gitlab_report.database.models import Issue, IssueState
+from gitlab_report.database.planner import plan_queries
+from gitlab_report.export.markdown import generate_markdown
+from gitlab_report.report import ReportConfig, create_report
+
+from .conftest import assert_shared, summarize
+
+
+def _database(server: MockGitLab, **kwargs) -> Database:
+    return Database(url=server.url, access_token="token", **kwargs)
+
+
+def test_get_issues_projects(server: MockGitLab, issues: list[Issue]) -> None:
+    with _database(server, concurrency=4) as db:
+        fetched = db.get_issues()
+
+    # Each project is fetched once, however many pages list its issues.
+    assert server.counts["/issues"] > 1
+    assert server.counts["/projects/:id"] == len({issue.project.id for issue in issues})
+
+    assert {
+        project.id: members.total()
+        for project, members in fetched.group_by(GroupBy.Project).items()
+    } == Counter(issue.project.id for issue in issues)
+    assert {
+        group.id if group else None: members.total()
+        for group, members in fetched.group_by(GroupBy.Group).items()
+    } == Counter(issue.group.id if issue.group else None for issue in issues)
+
+
+def test_iter_issues(server: MockGitLab, issues: list[Issue]) -> None:
+    with _database(server) as db:
+        fetched = db.iter_issues(per_page=50)
+
+        # Issues of a page are yielded once the next page has been fetched.
+        first = next(fetched)
+        assert server.counts["/issues"] == 2
+
+        fetched = [first, *fetched]
+
+    # Pagination ends with the last page.
+    assert server.counts["/issues"] == len(issues) // 50
+    assert list(map(summarize, fetched)) == list(map(summarize, issues))
+
+
+def test_shared_instances(server: MockGitLab, tmp_path: Path) -> None:
+    with IssueStore(tmp_path / "issues.sqlite", instance="mock") as store:
+        with _database(server) as db:
+            fetched = list(db.iter_issues(per_page=50))
+        assert_shared(fetched)
+
+        store.upsert(fetched)
+        assert_shared(list(store.iter_issues()))
+
+
+def test_get_issues_queries(server: MockGitLab, issues: list[Issue]) -> None:
+    labels = sorted({label for issue in issues for label in issue.labels})
+    projects = sorted({issue.project.id for issue in issues})
+    sections = [
+        SectionConfig(title="Open", state="opened", project=set(projects[:3])),
+        SectionConfig(title="Incidents", type="incident", label=set(labels[:2])),
+        SectionConfig(title="Labelled", label=labels[0]),
+    ]
+    queries = plan_queries(sections)
+    assert len(queries) > 1
+
+    with _database(server) as db:
+        fetched = db.get_issues(queries=queries)
+        ids = {issue.id for query in queries for issue in db.iter_issues(query=query)}
+
+    # Issues matching several queries are only kept once.
+    assert fetched.total() == len(ids)
+    assert server.counts["/issues"] + server.counts["/projects/:id/issues"] > 1
+
+    everything = Issues(issues)
+    for section in sections:
+        assert fetched.filter(section).total() == everything.filter(section).total()
+
+
+def test_count_only(server: MockGitLab) -> None:
+    sections = [
+        {
+            "title": "Open",
+            "state": "opened",
+            "group_by": [
+                {"title": "Incidents", "type": "incident"},
+                {"title": "Unassigned", "assignee": "None"},
+            ],
+            "columns": [{"title": "Labelled", "label": "Any"}],
+        },
+        {
+            "title": "Overdue",
+            "overdue": True,
+            "group_by": [{"title": "Issues", "type": "issue"}],
+            "columns": [{"title": "Closed", "state": "closed"}],
+        },
+        {
+            "title": "By project",
+            "group_by": "project",
+            "columns": [{"title": "Open", "state": "opened"}],
+        },
+    ]
+    options = {"url": server.url, "access_token": "token"}
+
+    # Sections are counted from totals, fetched issues or both.
+    for section in sections:
+        config = ReportConfig(period_from="2024-03-01T00:00:00Z", sections=[section])
+        assert generate_markdown(
+            create_report(config, count_only=True, **options)
+        ) == generate_markdown(create_report(config, **options))
+
+
+def test_sync(server: MockGitLab, issues: list[Issue], tmp_path: Path) -> None:
+    with IssueStore(tmp_path / "issues.sqlite", instance="mock") as store:
+        started = datetime.now(timezone.utc)
+        with _database(server, store=store) as db:
+            assert db.sync() == len(issues)
+        finished = datetime.now(timezone.utc)
+
+        # The mark is the start of the sync, less the margin for clock skew.
+        mark = datetime.fromisoformat(store.high_water_mark)
+        assert started - SYNC_CLOCK_SKEW <= mark <= finished - SYNC_CLOCK_SKEW
+
+        # Nothing has been updated since the cold sync.
+        server.counts.clear()
+        with _database(server, store=store) as db:
+            assert db.sync() == 0
+        assert server.counts["/issues"] == 1
+        assert sorted(map(summarize, store.iter_issues())) == sorted(
+            map(summarize, issues)
+        )
+
+        # Only the issue updated since the last sync is fetched.
+        now = datetime.now(timezone.utc).isoformat()
+        updated = dataclasses.replace(
+            issues[0], state=IssueState.Closed, updated_at=now, closed_at=now
+        )
+        with MockGitLab([updated, *issues[1:]]) as changed:
+            with _database(changed, store=store) as db:
+                assert db.sync() == 1
+
+        assert sorted(map(summarize, store.iter_issues())) == sorted(
+            map(summarize, [updated, *issues[1:]])
+        )
+
+
+def test_store_period(issues: list[Issue], tmp_path: Path) -> None:
+    with IssueStore(tmp_path / "issues.sqlite", instance="mock") as store:
+        store.upsert(issues)
+
+        # Periods are compared in UTC, whatever the time zone of their bounds.
+        after = datetime(2024, 3, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+        before = datetime(2024, 9, 30)
+        stored = list(store.iter_issues(created_after=after, created_before=before))
+
+    expected = [
+        issue
+        for issue in issues
+        if after
+        <= datetime.fromisoformat(issue.created_at)
+        <= before.replace(tzinfo=timezone.utc)
+    ]
+    assert expected
+    assert list(map(summarize, stored)) == list(map(summarize, expected))
+
+
+def test_throttled(issues: list[Issue]) -> None:
+    with MockGitLab(issues, throttle_rate=0.3, retry_after=0) as server:
+        with _database(server) as db:
+            fetched = list(db.iter_issues())
+
+    # Throttled requests are retried until they succeed.
+    assert server.throttled > 0
+    assert sorted(map(summarize, fetched)) == sorted(map(summarize, issues))
+
+
+def test_shared_session(server: MockGitLab, issues: list[Issue]) -> None:
+    session = open_session(concurrency=2)
+    for _ in range(2):
+        with _database(server, session=session) as db:
+            fetched = list(db.iter_issues(per_page=50))
+
+        # A shared session outlives the databases using it.
+        assert list(map(summarize, fetched)) == list(map(summarize, issues))
+
+    session.close()
+
+
+def test_rate_limit(issues: list[Issue]) -> None:
+    with MockGitLab(issues, rate_limit=5, rate_limit_window=60) as server:
+        responses = [
+            requests.get(
+                f"{server.url}/api/v4/issues", headers={"PRIVATE-TOKEN": "token"}
+            )
+            for _ in range(6)
+        ]
+
+    assert [response.status_code for response in responses] == [200] * 5 + [429]
+    assert [int(response.headers["RateLimit-Remaining"]) for response in responses] == [
+        4,
+        3,
+        2,
+        1,
+        0,
+        0,
+    ]
+    assert int(responses[-1].headers["Retry-After"]) > 0
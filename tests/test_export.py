@@ -0,0 +1,177 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from gitlab_report.blocks.section import Section
+from gitlab_report.database import Issues
+from gitlab_report.database.models import Issue
+from gitlab_report.export import Format, encoder, export_all
+from gitlab_report.export.html import generate_html
+from gitlab_report.export.markdown import generate_markdown
+from gitlab_report.report import Report, ReportConfig, build_report
+
+CONFIG = ReportConfig(
+    title="Labels",
+    sections=[
+        {
+            "title": "By label",
+            "group_by": "label",
+            "columns": [
+                {"title": "Open", "state": "opened"},
+                {"title": "Closed", "state": "closed"},
+            ],
+        },
+        {"title": "By project", "group_by": "project", "limit": 10},
+    ],
+)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_module(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Encode with orjson if it is installed, or with the json module."""
+    if request.param == "json":
+        monkeypatch.setattr(encoder, "orjson", None)
+    elif not encoder.orjson:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def _tree(report: Report) -> dict:
+    """Build the JSON tree of the whole report at once."""
+    return {
+        "title": report.title,
+        "image": report.image,
+        "period_from": (
+            report.period_from.strftime("%Y-%m-%d") if report.period_from else None
+        ),
+        "period_to": (
+            report.period_to.strftime("%Y-%m-%d") if report.period_to else None
+        ),
+        "sections": [
+            {
+                "title": section.title,
+                "total": section.total,
+                "groups": [
+                    {
+                        "title": group.title,
+                        "total": group.total,
+                        "columns": [
+                            {"title": column.title, "total": column.total}
+                            for column in group.columns
+                        ],
+                    }
+                    for group in section.groups
+                ],
+            }
+            for section in report.sections
+        ],
+    }
+
+
+@pytest.fixture
+def report(issues: list[Issue]) -> Report:
+    return build_report(CONFIG, Issues(issues))
+
+
+def test_export_markdown_and_html(
+    report: Report, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    title = Section.title
+    monkeypatch.setattr(
+        Section,
+        "title",
+        property(lambda section: calls.append(section) or title.fget(section)),
+    )
+
+    export_all(
+        report, [Format.Markdown, Format.HTML], output_dir=tmp_path, prefix="report"
+    )
+
+    # Markdown of each section is generated once for both formats.
+    assert len(calls) == len(report.sections)
+    assert (tmp_path / "report.md").read_text() == generate_markdown(report)
+    assert (tmp_path / "report.html").read_text() == generate_html(report)
+
+
+@pytest.mark.parametrize("format", [Format.Markdown, Format.HTML])
+def test_export_streamed(report: Report, tmp_path: Path, format: Format) -> None:
+    export_all(report, [format], output_dir=tmp_path, prefix="report")
+
+    # Content streamed part by part is the same as when generated at once.
+    if format == Format.Markdown:
+        assert (tmp_path / "report.md").read_text() == generate_markdown(report)
+    else:
+        assert (tmp_path / "report.html").read_text() == generate_html(report)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        CONFIG,
+        ReportConfig(title="Empty", sections=[]),
+        ReportConfig(title="Ungrouped", sections=[{"title": "All"}]),
+    ],
+)
+def test_export_json(
+    issues: list[Issue], tmp_path: Path, json_module: str, config: ReportConfig
+) -> None:
+    report = build_report(config, Issues(issues))
+    export_all(report, [Format.JSON], output_dir=tmp_path, prefix="report")
+
+    content = (tmp_path / "report.json").read_text(encoding="utf-8")
+    assert json.loads(content) == _tree(report)
+    # ASCII content is indented like the json module does.
+    assert content == json.dumps(_tree(report), indent=2)
+
+
+def test_export_json_non_ascii(
+    issues: list[Issue], tmp_path: Path, json_module: str
+) -> None:
+    config = ReportConfig(title="Überblick", sections=[{"title": "Früh"}])
+    report = build_report(config, Issues(issues))
+    export_all(report, [Format.JSON], output_dir=tmp_path, prefix="report")
+
+    content = (tmp_path / "report.json").read_text(encoding="utf-8")
+    assert json.loads(content) == _tree(report)
+
+
+@pytest.mark.parametrize("config", [CONFIG, ReportConfig(title="Empty", sections=[])])
+def test_export_ndjson(
+    issues: list[Issue], tmp_path: Path, json_module: str, config: ReportConfig
+) -> None:
+    report = build_report(config, Issues(issues))
+    export_all(report, [Format.NDJSON], output_dir=tmp_path, prefix="report")
+
+    lines = (tmp_path / "report.ndjson").read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+
+    tree = _tree(report)
+    expected = [
+        {"type": "report", **{key: tree[key] for key in tree if key != "sections"}}
+    ]
+    for section in tree["sections"]:
+        expected.append(
+            {"type": "section", "section": section["title"], "total": section["total"]}
+        )
+        for group in section["groups"]:
+            expected.append(
+                {
+                    "type": "group",
+                    "section": section["title"],
+                    "group": group["title"],
+                    "total": group["total"],
+                }
+            )
+            expected.extend(
+                {
+                    "type": "cell",
+                    "section": section["title"],
+                    "group": group["title"],
+                    "column": column["title"],
+                    "total": column["total"],
+                }
+                for column in group["columns"]
+            )
+    assert records == expected
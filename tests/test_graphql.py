@@ -0,0 +1,77 @@
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.server import MockGitLab
+from gitlab_report.database import GraphQLDatabase, ProjectCache
+from gitlab_report.database.models import Issue
+
+from .conftest import assert_shared, summarize
+
+
+def _database(server: MockGitLab, **kwargs) -> GraphQLDatabase:
+    return GraphQLDatabase(url=server.url, access_token="token", **kwargs)
+
+
+def test_iter_issues(server: MockGitLab, issues: list[Issue]) -> None:
+    with _database(server) as db:
+        fetched = list(db.iter_issues())
+
+    assert sorted(map(summarize, fetched)) == sorted(map(summarize, issues))
+    assert_shared(fetched)
+    # Pages of 100 issues, each with at most one query for its new projects.
+    assert server.counts["/api/graphql"] <= 2 * -(-len(issues) // 100)
+
+
+def test_iter_issues_period(server: MockGitLab, issues: list[Issue]) -> None:
+    created = sorted(datetime.fromisoformat(issue.created_at) for issue in issues)
+    after = created[len(issues) // 2]
+
+    with _database(server) as db:
+        fetched = list(db.iter_issues(created_after=after))
+
+    expected = [
+        issue for issue in issues if datetime.fromisoformat(issue.created_at) >= after
+    ]
+    assert sorted(map(summarize, fetched)) == sorted(map(summarize, expected))
+
+
+def test_resolve_projects(server: MockGitLab, issues: list[Issue]) -> None:
+    expected = {issue.project.id: issue.group for issue in issues}
+
+    with _database(server) as db:
+        projects = db._resolve_projects(set(expected))
+
+    assert projects.keys() == expected.keys()
+    for project_id, (project, group) in projects.items():
+        assert project.id == project_id
+        assert (group.id if group else None) == (
+            expected[project_id].id if expected[project_id] else None
+        )
+
+    # Projects of the same group share its instance.
+    groups = [group for _, group in projects.values() if group]
+    assert len({id(group) for group in groups}) == len({group.id for group in groups})
+
+
+def test_resolve_projects_cached(
+    server: MockGitLab, issues: list[Issue], tmp_path: Path
+) -> None:
+    project_ids = {issue.project.id for issue in issues}
+
+    with ProjectCache(tmp_path / "projects.sqlite", instance=server.url) as cache:
+        with _database(server, cache=cache) as db:
+            fetched = db._resolve_projects(project_ids)
+        assert server.counts["/api/graphql"] == 1
+
+        server.counts.clear()
+        with _database(server, cache=cache) as db:
+            cached = db._resolve_projects(project_ids)
+        assert server.counts["/api/graphql"] == 0
+
+    assert {
+        project_id: (project.name, group.id if group else None)
+        for project_id, (project, group) in cached.items()
+    } == {
+        project_id: (project.name, group.id if group else None)
+        for project_id, (project, group) in fetched.items()
+    }
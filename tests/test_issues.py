@@ -0,0 +1,250 @@
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from benchmarks.data import generate_issues
+from gitlab_report.database import Issues
+from gitlab_report.database.collections.issues import (
+    DAY,
+    Filter,
+    FilterKeyword,
+    GroupBy,
+)
+from gitlab_report.database.collections.table import timestamp
+from gitlab_report.database.models import Issue, IssueState, IssueType
+
+# Filters are checked against a naive evaluation of them issue by issue.
+
+
+def _values(issue: Issue, field: str) -> list[Any]:
+    """Get the keys of the values of the field of the issue."""
+    match field:
+        case "type" | "state":
+            return [getattr(issue, field)]
+        case "author":
+            return [issue.author.id]
+        case "assignee":
+            return [assignee.id for assignee in issue.assignees]
+        case "label":
+            return list(issue.labels)
+        case "group":
+            return [issue.group.id] if issue.group else []
+        case "project":
+            return [issue.project.id]
+    raise ValueError(field)
+
+
+def _overdue(issue: Issue, now: int) -> bool:
+    if not issue.due_date:
+        return False
+    deadline = timestamp(issue.due_date) + DAY
+    if issue.closed_at:
+        return timestamp(issue.closed_at) >= deadline
+    return issue.state == IssueState.Opened and now >= deadline
+
+
+def _matches(issue: Issue, filter: Filter, now: int) -> bool:
+    for field in ("type", "state", "author", "assignee", "label", "group", "project"):
+        value = getattr(filter, field)
+        if not value:
+            continue
+
+        values = _values(issue, field)
+        if not isinstance(value, set) and value == FilterKeyword.Any:
+            if not values:
+                return False
+        elif not isinstance(value, set) and value == FilterKeyword.None_:
+            if values:
+                return False
+        elif not set(values) & (value if isinstance(value, set) else {value}):
+            return False
+
+    if filter.overdue is not None and _overdue(issue, now) != filter.overdue:
+        return False
+
+    return True
+
+
+def _group_key(value: Any) -> Any:
+    return getattr(value, "id", value)
+
+
+def _groups(issues: list[Issue], group_by: GroupBy) -> dict[Any, set[int]]:
+    """Group the issues by each of their values, issues without any under None."""
+    groups: dict[Any, set[int]] = {}
+    for issue in issues:
+        for value in _values(issue, group_by.value) or [None]:
+            groups.setdefault(value, set()).add(issue.id)
+    return groups
+
+
+def _random_value(rng: random.Random, field: str, issues: list[Issue]) -> Any:
+    """Pick a single value, a set of values or a keyword for the field."""
+    if field in ("assignee", "label", "group") and rng.random() < 0.2:
+        return rng.choice([FilterKeyword.Any, FilterKeyword.None_])
+
+    if field == "type":
+        pool = list(IssueType)
+    elif field == "state":
+        pool = list(IssueState)
+    else:
+        pool = [
+            value for issue in rng.sample(issues, 20) for value in _values(issue, field)
+        ]
+        # Values no issue has.
+        pool.append("missing" if field == "label" else 10**9)
+
+    if not pool:
+        return None
+    if rng.random() < 0.5:
+        return rng.choice(pool)
+    return set(rng.sample(pool, rng.randint(0, min(3, len(pool)))))
+
+
+def _random_filter(rng: random.Random, issues: list[Issue]) -> Filter:
+    fields = {
+        field: _random_value(rng, field, issues)
+        for field in (
+            "type",
+            "state",
+            "author",
+            "assignee",
+            "label",
+            "group",
+            "project",
+        )
+        if rng.random() < 0.3
+    }
+    if rng.random() < 0.2:
+        fields["overdue"] = rng.random() < 0.5
+    return Filter(**fields)
+
+
+@pytest.fixture(scope="module")
+def issues() -> list[Issue]:
+    return generate_issues(2000, seed=3)
+
+
+@pytest.fixture(scope="module")
+def filters(issues: list[Issue]) -> list[Filter]:
+    rng = random.Random(0)
+    return [_random_filter(rng, issues) for _ in range(300)]
+
+
+def test_filter(issues: list[Issue], filters: list[Filter]) -> None:
+    collection = Issues(issues)
+    now = int(time.time())
+
+    for filter in filters:
+        filtered = collection.filter(filter)
+        expected = {issue.id for issue in issues if _matches(issue, filter, now)}
+        assert set(filtered.ids()) == expected, filter
+        assert filtered.total() == len(expected)
+
+
+def test_filter_chained(issues: list[Issue], filters: list[Filter]) -> None:
+    collection = Issues(issues)
+    now = int(time.time())
+
+    for first, second in zip(filters[::2], filters[1::2]):
+        expected = {
+            issue.id
+            for issue in issues
+            if _matches(issue, first, now) and _matches(issue, second, now)
+        }
+        # Results cached under the criteria do not depend on the order.
+        assert set(collection.filter(first).filter(second).ids()) == expected
+        assert set(collection.filter(second).filter(first).ids()) == expected
+
+
+def test_filter_empty() -> None:
+    collection = Issues([])
+    filter = Filter(label=FilterKeyword.None_, overdue=False)
+
+    assert collection.total() == 0
+    assert collection.ids() == []
+    assert collection.filter(filter).total() == 0
+    assert collection.group_by(GroupBy.Label) == {}
+    assert collection.cube(GroupBy.Label, [filter]) == {}
+
+
+def test_period(issues: list[Issue]) -> None:
+    collection = Issues(issues)
+    times = sorted(timestamp(issue.created_at) for issue in issues)
+
+    for after, before in [
+        (times[100], times[1500]),
+        (times[0], None),
+        (None, times[-1]),
+        (times[-1] + 1, None),
+    ]:
+        period = collection.period(
+            datetime.fromtimestamp(after, timezone.utc) if after else None,
+            datetime.fromtimestamp(before, timezone.utc) if before else None,
+        )
+        expected = {
+            issue.id
+            for issue in issues
+            if (after is None or timestamp(issue.created_at) >= after)
+            and (before is None or timestamp(issue.created_at) <= before)
+        }
+        assert set(period.ids()) == expected
+
+
+@pytest.mark.parametrize("group_by", list(GroupBy))
+def test_group_by(
+    issues: list[Issue], filters: list[Filter], group_by: GroupBy
+) -> None:
+    now = int(time.time())
+
+    for filter in [Filter(), *filters[:20]]:
+        filtered = Issues(issues).filter(filter)
+        selected = [issue for issue in issues if _matches(issue, filter, now)]
+
+        groups = filtered.group_by(group_by)
+        assert {
+            _group_key(group): set(members.ids()) for group, members in groups.items()
+        } == _groups(selected, group_by)
+
+
+@pytest.mark.parametrize("group_by", list(GroupBy))
+def test_cube(issues: list[Issue], filters: list[Filter], group_by: GroupBy) -> None:
+    now = int(time.time())
+    # More than 8 filters, so the flags are packed into several bytes.
+    columns = filters[20:31]
+
+    for filter in [Filter(), *filters[:10]]:
+        filtered = Issues(issues).filter(filter)
+        selected = [issue for issue in issues if _matches(issue, filter, now)]
+        by_id = {issue.id: issue for issue in selected}
+        expected = {
+            group: [
+                len(members),
+                *(
+                    sum(_matches(by_id[id], column, now) for id in members)
+                    for column in columns
+                ),
+            ]
+            for group, members in _groups(selected, group_by).items()
+        }
+
+        cube = filtered.cube(group_by, columns)
+        assert {_group_key(group): counts for group, counts in cube.items()} == (
+            expected
+        )
+        sizes = [counts[0] for counts in cube.values()]
+        assert sizes == sorted(sizes, reverse=True)
+
+        limited = filtered.cube(group_by, columns, limit=3)
+        assert len(limited) == min(3, len(expected))
+        for group, counts in limited.items():
+            assert counts == expected[_group_key(group)]
+        smallest = min((counts[0] for counts in limited.values()), default=0)
+        assert all(
+            counts[0] <= smallest
+            for group, counts in expected.items()
+            if group not in {_group_key(group) for group in limited}
+        )
@@ -0,0 +1,69 @@
+import gzip
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+import requests
+
+from gitlab_report import profiling
+
+BODY = json.dumps([{"id": id, "title": "issue"} for id in range(1000)]).encode()
+COMPRESSED = gzip.compress(BODY, mtime=0)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler serving the body compressed, chunked if requested by the path."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        body = COMPRESSED
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_profile_requests(url: str) -> None:
+    session = requests.Session()
+
+    with profiling.profile() as profiler:
+        profiling.instrument(session)
+        assert session.get(f"{url}/plain").content == BODY
+        for _ in range(2):
+            assert session.get(f"{url}/chunked").content == BODY
+
+    # Bytes are counted as received, i.e. compressed.
+    requests_ = profiler.summary()["requests"]
+    assert requests_["/plain"]["bytes_received"] == len(COMPRESSED)
+    assert requests_["/chunked"]["bytes_received"] == 2 * len(COMPRESSED)
+
+    # Requests are no longer recorded once profiling has ended.
+    assert session.hooks["response"] == []
+    session.get(f"{url}/plain")
+    assert profiler.summary()["requests"]["/plain"]["count"] == 1
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from benchmarks.server import MockGitLab
+from gitlab_report.database.collections.table import timestamp
+from gitlab_report.database.models import Issue
+from gitlab_report.export import json
+from gitlab_report.export.markdown import generate_markdown
+from gitlab_report.report import (
+    ReportConfig,
+    build_report,
+    create_report,
+    fetch_issues,
+)
+
+CONFIG = ReportConfig(
+    title="Issues",
+    period_from="2024-03-01T00:00:00Z",
+    sections=[
+        {
+            "title": "Open",
+            "state": "opened",
+            "group_by": [
+                {"title": "Incidents", "type": "incident"},
+                {"title": "Unassigned", "assignee": "None"},
+            ],
+            "columns": [{"title": "Labelled", "label": "Any"}],
+        },
+        {
+            "title": "By author",
+            "group_by": "author",
+            "limit": 5,
+            "columns": [{"title": "Closed", "state": "closed"}],
+        },
+    ],
+)
+
+
+def test_aggregate(server: MockGitLab, tmp_path: Path) -> None:
+    options = {"url": server.url, "access_token": "token"}
+    aggregated = create_report(CONFIG, **options)
+    loaded = create_report(CONFIG, aggregate=False, **options)
+
+    assert generate_markdown(aggregated) == generate_markdown(loaded)
+    json.export(aggregated, output_dir=tmp_path, prefix="aggregated")
+    json.export(loaded, output_dir=tmp_path, prefix="loaded")
+    assert (tmp_path / "aggregated.json").read_text() == (
+        tmp_path / "loaded.json"
+    ).read_text()
+
+    # Only blocks loaded without aggregation keep their issues.
+    for section in loaded.sections:
+        assert section.issues.total() == section.total
+        for group in section.groups:
+            assert group.issues.total() == group.total
+    for section in aggregated.sections:
+        with pytest.raises(ValueError):
+            section.issues
+
+
+def test_fetch_issues_mixed_time_zones(server: MockGitLab, issues: list[Issue]) -> None:
+    configs = [
+        ReportConfig(
+            period_from="2024-01-01T00:00:00",
+            period_to="2024-06-30T00:00:00",
+        ),
+        ReportConfig(
+            period_from="2024-03-01T00:00:00Z",
+            period_to="2024-09-30T00:00:00+02:00",
+        ),
+    ]
+
+    fetched = fetch_issues(configs, url=server.url, access_token="token")
+
+    after = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    before = datetime(2024, 9, 29, 22, tzinfo=timezone.utc)
+    assert fetched.total() == sum(
+        timestamp(after) <= timestamp(issue.created_at) <= timestamp(before)
+        for issue in issues
+    )
+
+
+def test_build_report(server: MockGitLab) -> None:
+    options = {"url": server.url, "access_token": "token"}
+    configs = [
+        CONFIG,
+        ReportConfig(
+            title="Closed",
+            period_from="2024-06-01T00:00:00Z",
+            period_to="2024-09-30T00:00:00Z",
+            sections=[{"title": "Closed", "state": "closed", "group_by": "label"}],
+        ),
+    ]
+
+    # Reports built from a single fetch match reports fetching their issues.
+    issues = fetch_issues(configs, **options)
+    for config in configs:
+        assert generate_markdown(build_report(config, issues)) == generate_markdown(
+            create_report(config, **options)
+        )
@@ -0,0 +1,97 @@
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import gitlab
+import pytest
+
+from benchmarks.server import MockGitLab
+from gitlab_report.database import Database
+from gitlab_report.database.models import Issue
+from gitlab_report.database.scheduler import ScheduledSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler redirecting requests of `/old` to `/new`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/new")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_redirect(url: str) -> None:
+    session = ScheduledSession(concurrency=1)
+    responses = []
+
+    # The redirect is sent in a thread, so the test fails rather than hangs.
+    thread = threading.Thread(
+        target=lambda: responses.append(session.get(f"{url}/old")), daemon=True
+    )
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    [response] = responses
+    assert response.status_code == 200
+    assert response.url == f"{url}/new"
+    assert [previous.status_code for previous in response.history] == [301]
+
+    response = session.get(f"{url}/old", allow_redirects=False)
+    assert response.status_code == 301
+    assert response.next.url == f"{url}/new"
+
+
+def test_retries(issues: list[Issue]) -> None:
+    session = ScheduledSession(max_retries=2, backoff=0.01)
+    with MockGitLab(issues, throttle_rate=1.0, retry_after=0) as server:
+        with pytest.raises(gitlab.exceptions.GitlabError):
+            Database(url=server.url, access_token="token", session=session)
+
+    # Throttled requests are not retried by python-gitlab on top of the session.
+    assert server.throttled == 3
+
+
+def test_rate_limit(issues: list[Issue]) -> None:
+    session = ScheduledSession(concurrency=4, backoff=0.01)
+    with MockGitLab(issues, rate_limit=5, rate_limit_window=0.2) as server:
+        url = f"{server.url}/api/v4/user"
+        with ThreadPoolExecutor(4) as executor:
+            responses = list(
+                executor.map(
+                    lambda _: session.get(url, headers={"PRIVATE-TOKEN": "token"}),
+                    range(20),
+                )
+            )
+
+    # Requests over the limit are retried once the window has been reset.
+    assert [response.status_code for response in responses] == [200] * 20
@@ -0,0 +1,15 @@
+import requests
+
+from gitlab_report.database import Transport, open_session
+
+
+def test_open_session() -> None:
+    defaults = requests.Session().headers
+
+    session = open_session()
+    assert session.headers["Accept-Encoding"] == defaults["Accept-Encoding"]
+    assert session.headers["Connection"] == defaults["Connection"]
+
+    session = open_session(Transport(keep_alive=False, compression=False))
+    assert session.headers["Accept-Encoding"] == "identity"
+    assert session.headers["Connection"] == "close"